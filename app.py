@@ -16,15 +16,21 @@
 
 # 标准库导入（按字母顺序）
 import atexit
+import hashlib
 import logging
+import mimetypes
+import multiprocessing
 import os
+import queue
+import re
 import socket
 import sys
 import threading
 import time
-import uuid
-from logging.handlers import RotatingFileHandler
-from pathlib import Path
+import unicodedata
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from types import MappingProxyType
+from urllib.parse import quote
 
 # 第三方库导入（按字母顺序）
 from flask import (
@@ -32,34 +38,107 @@ from flask import (
     abort,
     flash,
     g,
-    has_request_context,
     jsonify,
     redirect,
     render_template,
     request,
+    Response,
     send_from_directory,
     session,
     url_for
 )
+from flask.json.provider import JSONProvider
+from jinja2 import FileSystemBytecodeCache
+from werkzeug.middleware.proxy_fix import ProxyFix
+from werkzeug.utils import safe_join
+
+try:
+    import orjson  # 可选依赖：JSON序列化加速，未安装时使用Flask默认的标准库json
+except ImportError:
+    orjson = None
+
+try:
+    import redis  # 可选依赖：配置 SESSION_REDIS_URL 时用于服务端会话存储
+    from flask_session import Session
+except ImportError:
+    redis = Session = None
+
+try:
+    import fcntl  # 仅POSIX可用：多个工作进程写同一日志文件时用文件锁串行化写入与滚动
+except ImportError:
+    fcntl = None
 
 # 本地模块导入（按工程规范）
 from config.constants import (
     ALLOWED_EXTENSIONS,
+    ASSETS_FOLDER,
     CLEANUP_INTERVAL,
     FILE_RETENTION,
+    JINJA_CACHE_FOLDER,
     LOG_FOLDER,
     MAX_CONTENT_LENGTH,
+    SESSION_REDIS_URL,
     SESSION_SECRET,
-    UPLOAD_FOLDER
+    SSL_CERT,
+    SSL_FOLDER,
+    SSL_KEY,
+    STATIC_PAGE_MAX_AGE,
+    STATIC_PAGES_FOLDER,
+    TRUSTED_PROXY_HOPS,
+    UPLOAD_FOLDER,
+    USE_X_SENDFILE,
+    WEB_FOLDER,
+    X_ACCEL_REDIRECT_PREFIX
 )
 from core.auth import AuthManager, AuthenticationError
 from core.file_manager import FileManager
-from core.log_analysis import AdvancedLogAnalyzer
+from core.log_analysis import LogReportCache
 from core.path_manager import PathManager
 from core.scheduler import CleanupScheduler
 from core.utils import FormatUtils, Pagination
 from mapper.db import Database
 
+# 根日志器的基础控制台输出（原由数据库模块导入时配置，现由应用入口统一配置）
+logging.basicConfig(level=logging.ERROR, format='%(asctime)s - %(levelname)s - %(message)s')
+
+# 访问日志器（模块级缓存，避免每个请求重复查找）
+ACCESS_LOGGER = logging.getLogger('access')
+
+# 控制台仅显示的系统初始化和启动信息（合并为一个正则，单次扫描即可判断）
+CONSOLE_ALLOWED_MESSAGES = (
+    "正在初始化系统路径",
+    "系统路径初始化完成",
+    "正在初始化Flask应用",
+    "Flask应用初始化完成",
+    "正在配置日志系统",
+    "日志系统配置完成",
+    "正在初始化核心组件",
+    "认证管理器初始化完成",
+    "文件管理器初始化完成",
+    "清理调度器初始化完成",
+    "清理调度器已启动",
+    "正在配置应用路由",
+    "应用路由配置完成",
+    "正在启动应用程序",
+    "找到可用端口",
+    "证书检测",
+    "应用程序已在"
+)
+CONSOLE_ALLOW_RE = re.compile('|'.join(map(re.escape, CONSOLE_ALLOWED_MESSAGES)))
+
+# 日志记录缺省字段，格式化时一次性合并到记录中
+LOG_RECORD_DEFAULTS = MappingProxyType({
+    'request_id': '-',
+    'client_ip': '-',
+    'method': '-',
+    'path': '-',
+    'status_code': '-',
+    'response_time': '-',
+    'user_agent': '-',
+    'user': '-',
+    'scheme': '-'
+})
+
 
 # ======================
 # 初始化路径
@@ -71,20 +150,69 @@ def initialize_system():
     # 修改路径显示为相对路径
     logging.info(f"   - 上传目录: {os.path.relpath(UPLOAD_FOLDER)}")
     logging.info(f"   - 日志目录: {os.path.relpath(LOG_FOLDER)}")
-    logging.info(f"   - 静态资源目录: {os.path.relpath(PathManager.get_assets_folder())}")
-    logging.info(f"   - 模板目录: {os.path.relpath(PathManager.get_web_folder())}")
+    logging.info(f"   - 静态资源目录: {os.path.relpath(ASSETS_FOLDER)}")
+    logging.info(f"   - 模板目录: {os.path.relpath(WEB_FOLDER)}")
 
 
 # ======================
 # Flask应用初始化配置
 # ======================
+class OrjsonProvider(JSONProvider):
+    """基于orjson的JSON提供器，响应体直接输出bytes，省去str到bytes的编码"""
+
+    @staticmethod
+    def _default(obj):
+        if hasattr(obj, '__html__'):
+            return str(obj.__html__())
+        raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=self._default).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        body = orjson.dumps(obj, default=self._default, option=orjson.OPT_APPEND_NEWLINE)
+        return self._app.response_class(body, mimetype='application/json')
+
+
 def initialize_flask_app():
     """初始化Flask应用"""
     app = Flask(__name__,
-                template_folder=str(PathManager.get_web_folder()),
-                static_folder=str(PathManager.get_assets_folder()))
+                template_folder=str(WEB_FOLDER),
+                static_folder=str(ASSETS_FOLDER))
     app.secret_key = SESSION_SECRET
     app.config['MAX_CONTENT_LENGTH'] = MAX_CONTENT_LENGTH
+    # 由Apache/lighttpd通过X-Sendfile发送文件，send_file只返回响应头
+    app.use_x_sendfile = USE_X_SENDFILE
+    # 部署在反向代理之后时，按可信层数从X-Forwarded-*还原客户端IP，避免所有请求共用代理IP触发按IP限流
+    if TRUSTED_PROXY_HOPS > 0:
+        app.wsgi_app = ProxyFix(app.wsgi_app, x_for=TRUSTED_PROXY_HOPS,
+                                x_proto=TRUSTED_PROXY_HOPS, x_host=TRUSTED_PROXY_HOPS)
+    # JSON响应不排序键、不缩进，减少序列化开销和响应体积
+    if orjson is not None:
+        app.json = OrjsonProvider(app)
+    else:
+        app.json.sort_keys = False
+        app.json.compact = True
+    # 模板只在启动时加载一次：关闭修改检测，编译结果写入字节码缓存供重启和其他工作进程复用
+    app.jinja_env.auto_reload = False
+    # 配置Redis时会话数据保存在服务端，Cookie只携带会话ID
+    if SESSION_REDIS_URL:
+        if Session is None:
+            logging.warning("未安装 Flask-Session/redis，继续使用签名Cookie会话")
+        else:
+            app.config['SESSION_TYPE'] = 'redis'
+            app.config['SESSION_REDIS'] = redis.Redis.from_url(SESSION_REDIS_URL)
+            Session(app)
+    try:
+        os.makedirs(JINJA_CACHE_FOLDER, exist_ok=True)
+        if os.access(JINJA_CACHE_FOLDER, os.W_OK):
+            app.jinja_env.bytecode_cache = FileSystemBytecodeCache(str(JINJA_CACHE_FOLDER))
+    except OSError as e:
+        logging.warning(f"模板缓存目录不可用，跳过字节码缓存: {str(e)}")
     logging.info("Flask应用初始化完成")
     return app
 
@@ -108,37 +236,152 @@ def setup_logging():
 
     # 日志格式配置
     class RequestFormatter(logging.Formatter):
-        """自定义日志格式化器，包含请求上下文"""
+        """自定义日志格式化器，包含请求上下文
+
+        layout 为接收字段字典并返回日志行的函数（f-string），
+        避免 % 格式模板在每条日志上的解析开销；时间戳按秒缓存。
+        """
+
+        def __init__(self, layout, datefmt=None):
+            super().__init__(datefmt=datefmt)
+            self.layout = layout
+            self._cached_second = None
+            self._cached_asctime = ''
+
+        def formatTime(self, record, datefmt=None):
+            second = int(record.created)
+            if second != self._cached_second:
+                self._cached_asctime = time.strftime(datefmt or self.default_time_format, self.converter(second))
+                self._cached_second = second
+            return self._cached_asctime
 
         def format(self, record):
-            # 确保所有字段都有默认值
-            defaults = {
-                'request_id': '-',
-                'client_ip': '-',
-                'method': '-',
-                'path': '-',
-                'status_code': '-',
-                'response_time': '-',
-                'user_agent': '-',
-                'user': '-',
-                'scheme': '-'
-            }
-            for key, val in defaults.items():
-                if not hasattr(record, key):
-                    setattr(record, key, val)
-            return super().format(record)
+            # 确保所有字段都有默认值（已有字段优先）
+            fields = {**LOG_RECORD_DEFAULTS, **record.__dict__}
+            fields['message'] = record.getMessage()
+            fields['asctime'] = self.formatTime(record, self.datefmt)
+            line = self.layout(fields)
+            if record.exc_info and not record.exc_text:
+                record.exc_text = self.formatException(record.exc_info)
+            if record.exc_text:
+                line = f"{line}\n{record.exc_text}"
+            if record.stack_info:
+                line = f"{line}\n{self.formatStack(record.stack_info)}"
+            return line
+
+    class BufferedRotatingFileHandler(RotatingFileHandler):
+        """带内存缓冲的滚动文件处理器
+
+        日志先写入内存缓冲区，在缓冲区写满、出现ERROR及以上级别日志或定时器到期时
+        一次性写入文件，并在写入时统一检查是否需要滚动，避免每条日志都执行 write/flush/stat。
+        gunicorn多个工作进程共用同一日志目录时，写入和滚动在文件锁（<日志文件>.lock）内进行，
+        其他进程已滚动时先重新打开当前文件，避免重复滚动覆盖备份或写入已改名的旧文件。
+        """
+
+        def __init__(self, *args, buffer_size=64 * 1024, flush_interval=30, **kwargs):
+            super().__init__(*args, **kwargs)
+            self.buffer_size = buffer_size
+            self.flush_interval = flush_interval
+            self._buffer = []
+            self._buffer_size = 0
+            self._lock_file = None
+            self._lock_pid = None
+            self._stop_event = threading.Event()
+            self._flush_thread = threading.Thread(target=self._flush_periodically, daemon=True)
+            self._flush_thread.start()
+            atexit.register(self.flush)
+
+        def _flush_periodically(self):
+            while not self._stop_event.wait(self.flush_interval):
+                self.flush()
+
+        def emit(self, record):
+            try:
+                msg = self.format(record) + self.terminator
+                self._buffer.append(msg)
+                self._buffer_size += len(msg)
+                if record.levelno >= logging.ERROR or self._buffer_size >= self.buffer_size:
+                    self._write_buffer()
+            except Exception:
+                self.handleError(record)
+
+        def _write_buffer(self):
+            """将缓冲区内容一次写入文件（调用方需持有处理器锁）"""
+            if not self._buffer:
+                return
+            data = ''.join(self._buffer)
+            self._buffer.clear()
+            self._buffer_size = 0
+            self._lock_process()
+            try:
+                self._reopen_if_rotated()
+                if self.stream is None:
+                    self.stream = self._open()
+                if self.maxBytes > 0:
+                    self.stream.seek(0, 2)
+                    # tell() 为字节偏移，缓冲内容按编码后的字节数计算（中文在UTF-8下每字符3字节）
+                    if self.stream.tell() + len(data.encode(self.encoding or 'utf-8', 'replace')) >= self.maxBytes:
+                        self.doRollover()
+                self.stream.write(data)
+                self.stream.flush()
+            finally:
+                self._unlock_process()
+
+        def _lock_process(self):
+            """获取跨进程文件锁（锁文件按进程打开，fork继承的描述符不能互斥）"""
+            if fcntl is None:
+                return
+            if self._lock_pid != os.getpid():
+                self._lock_file = open(self.baseFilename + '.lock', 'a')
+                self._lock_pid = os.getpid()
+            fcntl.flock(self._lock_file, fcntl.LOCK_EX)
+
+        def _unlock_process(self):
+            if fcntl is not None and self._lock_file is not None:
+                fcntl.flock(self._lock_file, fcntl.LOCK_UN)
+
+        def _reopen_if_rotated(self):
+            """日志文件已被其他进程滚动（改名或删除）时关闭旧文件，随后重新打开"""
+            if self.stream is None:
+                return
+            try:
+                current = os.stat(self.baseFilename)
+            except FileNotFoundError:
+                current = None
+            opened = os.fstat(self.stream.fileno())
+            if current is None or (current.st_dev, current.st_ino) != (opened.st_dev, opened.st_ino):
+                self.stream.close()
+                self.stream = None
+
+        def flush(self):
+            self.acquire()
+            try:
+                self._write_buffer()
+            finally:
+                self.release()
+
+        def close(self):
+            self._stop_event.set()
+            self.flush()
+            super().close()
+            if self._lock_file is not None:
+                self._lock_file.close()
+                self._lock_file = None
+                self._lock_pid = None
 
     # 主日志格式
-    main_format = (
-        '[%(asctime)s] [%(levelname)-8s] '
-        '[%(name)-20s] [%(client_ip)s] [%(user)s] '
-        '%(message)s '
-        '[%(scheme)s://%(method)s => %(status_code)s in %(response_time)sms]'
-    )
+    def main_format(f):
+        return (
+            f"[{f['asctime']}] [{f['levelname']:<8}] "
+            f"[{f['name']:<20}] [{f['client_ip']}] [{f['user']}] "
+            f"{f['message']} "
+            f"[{f['scheme']}://{f['method']} => {f['status_code']} in {f['response_time']}ms]"
+        )
+
     date_format = '%Y-%m-%d %H:%M:%S'
 
     # 1. 应用日志（记录所有INFO和WARNING事件）
-    app_log_handler = RotatingFileHandler(
+    app_log_handler = BufferedRotatingFileHandler(
         os.path.join(LOG_FOLDER, 'application.log'),
         maxBytes=1024 * 1024 * 100,  # 100MB
         backupCount=5,
@@ -148,23 +391,26 @@ def setup_logging():
     app_log_handler.setLevel(logging.INFO)
 
     # 2. 访问日志（专门记录HTTP请求）
-    access_log_handler = RotatingFileHandler(
+    access_log_handler = BufferedRotatingFileHandler(
         os.path.join(LOG_FOLDER, 'access.log'),
         maxBytes=1024 * 1024 * 50,  # 50MB
         backupCount=3,
-        encoding='utf-8'
+        encoding='utf-8',
+        buffer_size=1024 * 1024  # 访问日志量最大，使用1MB批量写入缓冲
     )
     access_log_handler.setFormatter(RequestFormatter(
-        '[%(asctime)s] [%(client_ip)s] [%(request_id)s] '
-        '"%(method)s %(path)s" %(status_code)s '
-        '%(response_time)sms "%(user_agent)s"',
+        lambda f: (
+            f"[{f['asctime']}] [{f['client_ip']}] [{f['request_id']}] "
+            f"\"{f['method']} {f['path']}\" {f['status_code']} "
+            f"{f['response_time']}ms \"{f['user_agent']}\""
+        ),
         datefmt=date_format
     ))
     access_log_handler.setLevel(logging.INFO)
     access_log_handler.addFilter(lambda record: record.name == 'access')
 
     # 3. 错误日志（记录所有错误）
-    error_log_handler = RotatingFileHandler(
+    error_log_handler = BufferedRotatingFileHandler(
         os.path.join(LOG_FOLDER, 'error.log'),
         maxBytes=1024 * 1024 * 50,  # 50MB
         backupCount=3,
@@ -177,72 +423,69 @@ def setup_logging():
     console_handler = logging.StreamHandler()
 
     # 修改控制台日志格式（删除冗余字段）
+    level_colors = {'DEBUG': '36', 'INFO': '32', 'WARNING': '33', 'ERROR': '31', 'CRITICAL': '41'}
     console_formatter = RequestFormatter(
-        '\033[1;34m%(asctime)s\033[0m '
-        '[\033[1;%(colorcode)sm%(levelname)-8s\033[0m] '
-        '[\033[1;35m%(name)-20s\033[0m] '
-        '%(message)s '
-        '\033[1;30m[%(scheme)s://%(method)s => %(status_code)s in %(response_time)sms]\033[0m',
+        lambda f: (
+            f"\033[1;34m{f['asctime']}\033[0m "
+            f"[\033[1;{level_colors.get(f['levelname'], '37')}m{f['levelname']:<8}\033[0m] "
+            f"[\033[1;35m{f['name']:<20}\033[0m] "
+            f"{f['message']} "
+            f"\033[1;30m[{f['scheme']}://{f['method']} => {f['status_code']} in {f['response_time']}ms]\033[0m"
+        ),
         datefmt=date_format
     )
     console_handler.setFormatter(console_formatter)
     console_handler.setLevel(logging.INFO)
 
-    # 控制台日志颜色过滤器
-
-    # 控制台日志颜色过滤器（修改过滤逻辑）
+    # 控制台日志过滤器（仅显示系统初始化和启动信息）
     class ConsoleFilter(logging.Filter):
         def filter(self, record):
-            # 仅显示系统初始化和启动信息
-            allowed_messages = [
-                "正在初始化系统路径",
-                "系统路径初始化完成",
-                "正在初始化Flask应用",
-                "Flask应用初始化完成",
-                "正在配置日志系统",
-                "日志系统配置完成",
-                "正在初始化核心组件",
-                "认证管理器初始化完成",
-                "文件管理器初始化完成",
-                "清理调度器初始化完成",
-                "清理调度器已启动",
-                "正在配置应用路由",
-                "应用路由配置完成",
-                "正在启动应用程序",
-                "找到可用端口",
-                "证书检测",
-                "应用程序已在"
-            ]
-
             # 只允许系统初始化阶段日志且来自root日志器
             return (
                     record.name == 'root' and
-                    any(msg in record.getMessage() for msg in allowed_messages) and
-                    not hasattr(record, 'request_id')
+                    not hasattr(record, 'request_id') and
+                    CONSOLE_ALLOW_RE.search(record.getMessage()) is not None
             )
 
     console_handler.addFilter(ConsoleFilter())
 
+    # 访问日志只写入 access.log，应用/错误日志不再重复记录
+    def exclude_access(record):
+        return record.name != 'access'
+
+    app_log_handler.addFilter(exclude_access)
+    error_log_handler.addFilter(exclude_access)
+
+    # 异步写入：请求线程只负责入队，过滤、格式化和输出均由后台监听线程统一完成
+    log_queue = queue.Queue(-1)
+    queue_handler = QueueHandler(log_queue)
+    listener = QueueListener(
+        log_queue,
+        app_log_handler,
+        error_log_handler,
+        access_log_handler,
+        console_handler,
+        respect_handler_level=True
+    )
+    listener.start()
+    atexit.register(listener.stop)
+
     # 配置根日志器
     root_logger = logging.getLogger()
     root_logger.setLevel(logging.DEBUG)
-    root_logger.addHandler(app_log_handler)
-    root_logger.addHandler(error_log_handler)
-    root_logger.addHandler(console_handler)
+    root_logger.addHandler(queue_handler)
 
-    # 创建专门地访问日志器
-    access_logger = logging.getLogger('access')
-    access_logger.setLevel(logging.INFO)
-    access_logger.addHandler(access_log_handler)
-    access_logger.propagate = False
+    # 配置专门地访问日志器
+    ACCESS_LOGGER.setLevel(logging.INFO)
+    ACCESS_LOGGER.addHandler(queue_handler)
+    ACCESS_LOGGER.propagate = False
 
-    # 配置模块日志器
+    # 配置模块日志器（不单独挂载处理器，统一经根日志器的队列处理器输出）
     modules = ['auth', 'file_manager', 'scheduler', 'werkzeug']
     for module in modules:
         module_logger = logging.getLogger(module)
         module_logger.setLevel(logging.DEBUG)
-        module_logger.addHandler(app_log_handler)
-        module_logger.propagate = False
+        module_logger.propagate = True
 
     # 抑制werkzeug的访问日志（使用我们自己的）
     logging.getLogger('werkzeug').setLevel(logging.WARNING)
@@ -253,116 +496,196 @@ def setup_logging():
     logging.info(f"   - 错误日志: {os.path.relpath(os.path.join(LOG_FOLDER, 'error.log'))}")
 
 
+# ======================
+# 请求日志上下文
+# ======================
+# 应用日志器
+APP_LOGGER = logging.getLogger('app')
+
+# 线程级日志上下文：请求开始时填充一次，同一请求内所有日志调用复用同一个extra字典
+_log_local = threading.local()
+
+# 非请求上下文（后台任务等）使用的日志字段
+SYSTEM_LOG_CONTEXT = MappingProxyType({
+    'method': 'SYSTEM',
+    'path': 'N/A',
+    'scheme': 'internal',
+    'client_ip': '-',
+    'user_agent': '-',
+    'request_id': 'SYSTEM',
+    'user': 'SYSTEM',
+    'status_code': 0,
+    'response_time': 0
+})
+
+
+# 请求ID随机数池：每个线程一次读取4KB随机字节，按4字节切分为8位十六进制ID
+REQUEST_ID_POOL_SIZE = 4096
+_request_id_local = threading.local()
+
+
+def next_request_id():
+    """生成8位十六进制请求ID（每1024个ID才触发一次系统随机数调用）"""
+    pool = _request_id_local
+    offset = getattr(pool, 'offset', REQUEST_ID_POOL_SIZE)
+    if offset >= REQUEST_ID_POOL_SIZE:
+        pool.buffer = os.urandom(REQUEST_ID_POOL_SIZE)
+        offset = 0
+    pool.offset = offset + 4
+    return pool.buffer[offset:offset + 4].hex()
+
+
+def elapsed_ms():
+    """返回当前请求已耗时（毫秒）"""
+    return (time.perf_counter_ns() - g.start_ns) // 1_000_000
+
+
+def _log(level, msg, fields, exc_info=False):
+    """使用当前请求的日志上下文记录应用日志"""
+    context = getattr(_log_local, 'context', None)
+    if context is None:
+        context = dict(SYSTEM_LOG_CONTEXT)
+    else:
+        context['response_time'] = elapsed_ms()
+    if fields:
+        context.update(fields)
+    APP_LOGGER.log(level, msg, exc_info=exc_info, extra=context)
+
+
+def log_info(msg, exc_info=False, **fields):
+    """记录INFO级别应用日志，fields会更新当前请求的日志上下文（如status_code）"""
+    _log(logging.INFO, msg, fields, exc_info)
+
+
+def log_warning(msg, exc_info=False, **fields):
+    """记录WARNING级别应用日志"""
+    _log(logging.WARNING, msg, fields, exc_info)
+
+
+def log_error(msg, exc_info=False, **fields):
+    """记录ERROR级别应用日志"""
+    _log(logging.ERROR, msg, fields, exc_info)
+
+
 # ======================
 # 请求钩子（记录详细访问日志）
 # ======================
 def setup_request_hooks(app):
+    static_prefix = app.static_url_path + '/'
+
     @app.before_request
     def before_request():
         """为每个请求分配唯一ID并记录开始时间"""
-        request.start_time = time.time()
-        request.id = uuid.uuid4().hex[:8]
-        g.log_context = {
+        # 静态资源请求不记录日志（after_request 中无日志上下文时直接返回）
+        if request.path.startswith(static_prefix):
+            return
+        g.start_ns = time.perf_counter_ns()
+        request.id = next_request_id()
+        # 同一请求内的多次数据库查询复用同一个池连接
+        Database.begin_request()
+        # 当前登录用户（每个请求只读取一次会话），未登录为None
+        g.user = session.get('username')
+        _log_local.context = {
             'request_id': request.id,
             'method': request.method,  # 直接获取实时方法
             'path': request.path,  # 直接获取实时路径
+            'scheme': request.environ.get('wsgi.url_scheme', 'http'),
+            'client_ip': request.remote_addr or '-',
             'user_agent': request.headers.get('User-Agent', '-'),
+            'user': g.user or 'GUEST',  # 默认用户标识
             'status_code': 200,
-            'response_time': 0,
-            'client_ip': request.remote_addr or '-',
-            'user': session.get('username', 'GUEST'),  # 默认用户标识
-            'scheme': request.environ.get('wsgi.url_scheme', 'http'),
+            'response_time': 0
         }
 
     @app.after_request
     def after_request(response):
         """增强的请求日志记录"""
-        response_time = (time.time() - request.start_time) * 1000
-        log_context = getattr(g, 'log_context', {})
-
-        # 动态获取最终请求属性
-        final_method = request.environ.get('REQUEST_METHOD', request.method)
-        final_path = request.environ.get('PATH_INFO', request.path)
-        final_scheme = request.environ.get('wsgi.url_scheme', 'http')
-
-        log_context.update({
-            'status_code': response.status_code,
-            'response_time': f"{response_time:.2f}",
-            'method': final_method,
-            'path': final_path,
-            'scheme': final_scheme
-        })
+        log_context = getattr(_log_local, 'context', None)
+        if log_context is None:
+            return response
+
+        response_time = (time.perf_counter_ns() - g.start_ns) / 1_000_000
+        # 方法、路径、协议已在请求开始时记录，此处只补充响应信息
+        log_context['status_code'] = response.status_code
+        log_context['response_time'] = f"{response_time:.2f}"
 
         # 记录访问日志（使用独立日志器）
-        access_logger = logging.getLogger('access')
-        access_logger.info(
-            f"{response.status_code} {final_method} {final_path}",
+        ACCESS_LOGGER.info(
+            f"{response.status_code} {log_context['method']} {log_context['path']}",
             extra=log_context
         )
 
         return response
 
+    @app.teardown_request
+    def teardown_request(error=None):
+        """请求结束后清理线程级日志上下文，并归还请求期间绑定的数据库连接"""
+        _log_local.context = None
+        Database.release_connection()
+
 
 # ======================
-# 更新日志适配器
+# 文件下载响应
 # ======================
-class RequestLoggerAdapter(logging.LoggerAdapter):
-    def process(self, msg, kwargs):
-        extra = kwargs.get('extra', {})
-        request_context = {}
-
-        if has_request_context():
-            request_context = {
-                'method': request.method,
-                'path': request.path,
-                'scheme': request.scheme,
-                'client_ip': request.remote_addr or '-',
-                'user_agent': request.headers.get('User-Agent', '-'),
-                'request_id': getattr(request, 'id', 'SYSTEM'),
-                'user': session.get('username', 'GUEST')
-            }
-        else:
-            request_context = {
-                'method': 'SYSTEM',
-                'path': 'N/A',
-                'scheme': 'internal',
-                'client_ip': '-',
-                'user_agent': '-',
-                'request_id': 'SYSTEM',
-                'user': 'SYSTEM'
-            }
+def build_accel_redirect_response(filename):
+    """
+    构建Nginx X-Accel-Redirect下载响应
+    文件内容由Nginx的internal location通过sendfile直接发送，不经过Python进程
+    参数：
+    - filename: 相对上传目录的文件路径
+    异常：
+    - FileNotFoundError: 文件不存在或路径越界
+    """
+    file_path = safe_join(str(UPLOAD_FOLDER), filename)
+    if file_path is None or not os.path.isfile(file_path):
+        raise FileNotFoundError(filename)
 
-        merged_context = {
-            'status_code': 0,
-            'response_time': 0,
-            **request_context,
-            **extra
-        }
+    download_name = os.path.basename(file_path)
+    try:
+        download_name.encode('ascii')
+        names = {'filename': download_name}
+    except UnicodeEncodeError:
+        simple = unicodedata.normalize('NFKD', download_name).encode('ascii', 'ignore').decode('ascii')
+        names = {'filename': simple, 'filename*': f"UTF-8''{quote(download_name, safe='!#$&+-.^_`|~')}"}
+
+    response = Response(mimetype=mimetypes.guess_type(download_name)[0] or 'application/octet-stream')
+    response.headers.set('Content-Disposition', 'attachment', **names)
+    response.headers['X-Accel-Redirect'] = X_ACCEL_REDIRECT_PREFIX.rstrip('/') + '/' + quote(filename)
+    return response
 
-        # 增强的response_time处理
-        try:
-            rt = merged_context.get('response_time', 0)
-            if callable(rt):
-                rt = rt()
-            merged_context['response_time'] = float(rt)
-        except (TypeError, ValueError):
-            merged_context['response_time'] = 0.0
-
-        # 确保status_code为整型
-        try:
-            merged_context['status_code'] = int(merged_context.get('status_code', 0))
-        except (TypeError, ValueError):
-            merged_context['status_code'] = 0
 
-        kwargs['extra'] = merged_context
-        return msg, kwargs
+def export_static_page(template, body):
+    """
+    将预渲染的静态页面写入 STATIC_PAGES_FOLDER，供Nginx直接发送
+    内容未变化时不重写；目录不可写时仅记录警告，页面仍由应用路由提供
+    """
+    path = os.path.join(STATIC_PAGES_FOLDER, template)
+    try:
+        with open(path, 'rb') as f:
+            if f.read() == body:
+                return
+    except OSError:
+        pass
+    try:
+        os.makedirs(STATIC_PAGES_FOLDER, exist_ok=True)
+        # 先写临时文件再替换，避免Nginx读到写了一半的页面
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(body)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        logging.warning(f"导出静态页面 {template} 失败: {str(e)}")
 
 
 # ======================
 # 核心组件初始化
 # ======================
-def initialize_core_components():
-    """初始化核心组件"""
+def initialize_core_components(start_scheduler=True):
+    """
+    初始化核心组件
+    参数：
+    - start_scheduler: 是否启动清理调度器（多进程部署时只需一个进程启动）
+    """
     logging.info("正在初始化核心组件：")
 
     # 认证管理器
@@ -378,14 +701,16 @@ def initialize_core_components():
 
     # 清理调度器
     global scheduler
-    scheduler = CleanupScheduler(CLEANUP_INTERVAL, FILE_RETENTION, UPLOAD_FOLDER)
+    scheduler = CleanupScheduler(CLEANUP_INTERVAL, FILE_RETENTION, UPLOAD_FOLDER,
+                                 tasks=(auth.purge_expired_codes,))
     # // 相对路径
     logging.info(f"   - 清理调度器初始化完成 - 清理间隔: {CLEANUP_INTERVAL / 60 / 60 / 24} 天")
 
     # 启动调度器
-    scheduler.start()
-    logging.info("   - 清理调度器已启动")
-    atexit.register(scheduler.stop)
+    if start_scheduler:
+        scheduler.start()
+        logging.info("   - 清理调度器已启动")
+        atexit.register(scheduler.stop)
 
 
 # ======================
@@ -393,22 +718,20 @@ def initialize_core_components():
 # ======================
 def setup_routes(app):
     """配置所有应用路由"""
+    # 动态页面模板（路由配置完成后预加载，渲染时跳过按名称查找模板）
+    templates = {}
+
+    def render_page(template, **context):
+        """使用预加载模板渲染页面，保留Flask注入的上下文变量"""
+        app.update_template_context(context)
+        return templates[template].render(context)
 
     @app.route('/login', methods=['GET', 'POST'])
     def login():
         """登录路由"""
-        start_time = time.time()
-        log_ctx = {
-            'status_code': 302,
-            'response_time': 0,
-            'method': request.method,
-            'path': request.path,
-            'client_ip': request.remote_addr or '-'
-        }
-
         if request.method == 'GET':
-            logger.info("访问登录页面", extra=log_ctx)
-            return render_template('login.html')
+            log_info("访问登录页面")
+            return render_page('login.html')
 
         username = request.form.get('username', '').strip()
         password = request.form.get('password', '').strip()
@@ -417,20 +740,14 @@ def setup_routes(app):
             valid, message = auth.validate_credentials(username, password)
             if valid:
                 session['username'] = username.upper()
-                log_ctx['status_code'] = 200
-                log_ctx['response_time'] = int((time.time() - start_time) * 1000)
-                logger.info(f"用户 {username} 登录成功", extra=log_ctx)
+                log_info(f"用户 {username} 登录成功", status_code=200)
                 return redirect(url_for('index'))
 
-            log_ctx['status_code'] = 401
-            log_ctx['response_time'] = int((time.time() - start_time) * 1000)
-            logger.warning(f"用户 {username} 登录失败: {message}", extra=log_ctx)
-            return render_template('login.html', error=message)
+            log_warning(f"用户 {username} 登录失败: {message}", status_code=401)
+            return render_page('login.html', error=message)
         except Exception as e:
-            log_ctx['status_code'] = 500
-            log_ctx['response_time'] = int((time.time() - start_time) * 1000)
-            logger.error(f"登录异常: {str(e)}", extra=log_ctx)
-            return render_template('login.html', error="系统错误")
+            log_error(f"登录异常: {str(e)}", status_code=500)
+            return render_page('login.html', error="系统错误")
 
     @app.route('/register', methods=['POST'])
     def register():
@@ -439,17 +756,17 @@ def setup_routes(app):
             # 增加用户存在性检查
             existing_user = auth._load_user(email)
             if existing_user:
-                return render_template('login.html', error="该邮箱已注册")
+                return render_page('login.html', error="该邮箱已注册")
 
             code = request.form.get('code').strip()
             password = request.form.get('password').strip()
             confirm_password = request.form.get('confirmPassword').strip()
 
             if password != confirm_password:
-                return render_template('login.html', error="两次密码输入不一致")
+                return render_page('login.html', error="两次密码输入不一致")
 
             if not auth.verify_code(email, code):
-                return render_template('login.html', error="验证码错误或已过期")
+                return render_page('login.html', error="验证码错误或已过期")
 
             hashed_password = auth.hash_password(password)
 
@@ -457,60 +774,44 @@ def setup_routes(app):
             args = (email, hashed_password, email)
             try:
                 Database.execute_query(query, args)
-                logger.info(f"新用户注册成功: {email}")
+                log_info(f"新用户注册成功: {email}")
                 return redirect(url_for('login'))
             except Exception as db_error:
                 # 捕获数据库唯一性约束错误
                 if "Duplicate entry" in str(db_error):
-                    return render_template('login.html', error="该邮箱已注册")
-                logger.error(f"数据库插入用户失败: {str(db_error)}", exc_info=True)
-                return render_template('login.html', error="注册失败，请稍后重试")
+                    return render_page('login.html', error="该邮箱已注册")
+                log_error(f"数据库插入用户失败: {str(db_error)}", exc_info=True)
+                return render_page('login.html', error="注册失败，请稍后重试")
         except Exception as e:
-            logger.error(f"注册失败: {str(e)}")
-            return render_template('login.html', error="注册失败")
+            log_error(f"注册失败: {str(e)}")
+            return render_page('login.html', error="注册失败")
 
     @app.route('/logout')
     def logout():
         """注销路由"""
         username = session.pop('username', None)
         if username:
-            logger.info(f"用户 {username} 注销登录", extra={
-                'method': request.method,
-                'path': request.path,
-                'status_code': 200,
-                'client_ip': request.remote_addr or '-'
-            })
+            log_info(f"用户 {username} 注销登录", status_code=200)
         return redirect(url_for('login'))
 
     @app.route('/send_code', methods=['POST'])
     def send_verification_code():
         try:
             email = request.form.get('email').lower().strip()
-            code = auth.generate_verification_code(email)
+            code = auth.generate_verification_code(email, request.remote_addr)
             return jsonify(success=True, message="验证码已发送")
         except AuthenticationError as e:
-            logger.error(f"验证码发送失败: {str(e)}")
+            log_error(f"验证码发送失败: {str(e)}")
             return jsonify(success=False, message=str(e)), 400
         except Exception as e:
-            logger.error(f"邮件发送异常: {str(e)}")
+            log_error(f"邮件发送异常: {str(e)}")
             return jsonify(success=True, message="验证码已发送，请查收")
 
     @app.route('/', methods=['GET', 'POST'])
     def index():
         """主页路由"""
-        start_time = time.time()
-        log_ctx = {
-            'status_code': 200,
-            'response_time': 0,
-            'method': request.method,
-            'path': request.path,
-            'client_ip': request.remote_addr or '-'
-        }
-
-        if 'username' not in session:
-            log_ctx['status_code'] = 403
-            log_ctx['response_time'] = int((time.time() - start_time) * 1000)
-            logger.warning("未登录用户尝试访问主页", extra=log_ctx)
+        if g.user is None:
+            log_warning("未登录用户尝试访问主页", status_code=403)
             return redirect(url_for('login'))
 
         page = request.args.get('page', 1, type=int)
@@ -520,7 +821,7 @@ def setup_routes(app):
         if request.method == 'POST':
             if 'file' not in request.files:
                 flash('请选择文件', 'error')
-                logger.warning("用户提交表单但未选择文件", extra=log_ctx)
+                log_warning("用户提交表单但未选择文件")
             else:
                 uploaded_files = request.files.getlist('file')
                 success_count = 0
@@ -531,7 +832,7 @@ def setup_routes(app):
                     file_manager.validate_folder_size(uploaded_files)
                 except ValueError as e:
                     flash(str(e), 'error')
-                    logger.error(f"文件夹容量验证失败: {str(e)}", extra=log_ctx)
+                    log_error(f"文件夹容量验证失败: {str(e)}")
                     return redirect(url_for('index'))
 
                 for file in uploaded_files:
@@ -542,16 +843,15 @@ def setup_routes(app):
                         if file.content_length > file_manager.max_size:
                             raise ValueError("单个文件超过10GB限制")
 
-                        filename = file_manager.save_file(file, session['username'])
+                        filename = file_manager.save_file(file, g.user)
                         success_count += 1
-                        logger.info(f"用户 {session['username']} 上传文件 {filename} 成功", extra=log_ctx)
+                        log_info(f"用户 {g.user} 上传文件 {filename} 成功")
                     except ValueError as ve:
                         error_messages.append(f"{file.filename}: {str(ve)}")
-                        logger.error(f"文件大小验证失败: {file.filename} - {str(ve)}", extra=log_ctx)
+                        log_error(f"文件大小验证失败: {file.filename} - {str(ve)}")
                     except Exception as e:
                         error_messages.append(f"{file.filename}: 上传失败")
-                        logger.error(f"用户 {session['username']} 上传文件 {file.filename} 失败: {str(e)}",
-                                     extra=log_ctx, exc_info=True)
+                        log_error(f"用户 {g.user} 上传文件 {file.filename} 失败: {str(e)}", exc_info=True)
 
                 if success_count > 0:
                     flash(f'成功上传 {success_count} 个文件', 'success')
@@ -563,10 +863,12 @@ def setup_routes(app):
         try:
             data = file_manager.list_files(page=page)
             files = data['items']
-            for f in files:
-                f['size'] = FormatUtils.size(f['size'])
-                f['upload_time'] = FormatUtils.timestamp(f['upload_time'])
-                f['modified_time'] = FormatUtils.timestamp(f['modified_time'])
+            # 按列批量格式化，避免逐行调用格式化函数
+            sizes = FormatUtils.sizes(f['size'] for f in files)
+            upload_times = FormatUtils.timestamps(f['upload_time'] for f in files)
+            modified_times = FormatUtils.timestamps(f['modified_time'] for f in files)
+            for f, size, upload_time, modified_time in zip(files, sizes, upload_times, modified_times):
+                f.update(size=size, upload_time=upload_time, modified_time=modified_time)
 
             pagination = {
                 'current': data['page'],
@@ -575,171 +877,144 @@ def setup_routes(app):
             }
         except Exception as e:
             error = '获取文件列表失败，请稍后重试'
-            log_ctx['status_code'] = 500
-            log_ctx['response_time'] = int((time.time() - start_time) * 1000)
-            logger.error(f"获取文件列表时系统错误: {str(e)}", extra=log_ctx, exc_info=True)
+            log_error(f"获取文件列表时系统错误: {str(e)}", exc_info=True, status_code=500)
             flash(error, 'error')
 
-        log_ctx['response_time'] = int((time.time() - start_time) * 1000)
-        logger.info(f"用户 {session['username']} 访问主页", extra=log_ctx)
+        log_info(f"用户 {g.user} 访问主页")
+
+        return render_page('index.html', files=files, pagination=pagination)
 
-        return render_template('index.html', files=files, pagination=pagination)
+    @app.route('/upload_stream/<path:filename>', methods=['POST'])
+    def upload_stream(filename):
+        """
+        原始请求体上传（application/octet-stream），直接写入磁盘，不经过multipart解析
+        校验规则与表单上传一致，结果同样写入提示消息，由前端刷新页面后展示
+        """
+        if g.user is None:
+            log_warning(f"未授权用户尝试上传文件 {filename}", status_code=401)
+            return jsonify(success=False, message='请先登录'), 401
+
+        if request.content_length is None:
+            log_warning(f"上传文件 {filename} 缺少Content-Length", status_code=411)
+            return jsonify(success=False, message='缺少文件大小'), 411
+
+        try:
+            # 文件夹容量验证（与表单上传相同的后端校验，请求体即为唯一的上传文件）
+            file_manager.validate_folder_size([request])
+        except ValueError as e:
+            flash(str(e), 'error')
+            log_error(f"文件夹容量验证失败: {str(e)}", status_code=400)
+            return jsonify(success=False, message=str(e)), 400
+
+        try:
+            saved = file_manager.save_stream(request.stream, filename, g.user, request.content_length)
+        except ValueError as ve:
+            flash(f'部分文件上传失败: {filename}: {str(ve)}', 'error')
+            log_error(f"文件校验失败: {filename} - {str(ve)}", status_code=400)
+            return jsonify(success=False, message=str(ve)), 400
+        except Exception as e:
+            flash(f'部分文件上传失败: {filename}: 上传失败', 'error')
+            log_error(f"用户 {g.user} 上传文件 {filename} 失败: {str(e)}", exc_info=True, status_code=500)
+            return jsonify(success=False, message='上传失败'), 500
+
+        flash('成功上传 1 个文件', 'success')
+        log_info(f"用户 {g.user} 上传文件 {saved} 成功", status_code=200)
+        return jsonify(success=True, message="上传成功", filename=saved)
 
     @app.route('/download/<path:filename>')
     def download(filename):
         """文件下载路由"""
-        start_time = time.time()
-        log_ctx = {
-            'status_code': 200,
-            'response_time': 0,
-            'method': request.method,
-            'path': request.path,
-            'client_ip': request.remote_addr or '-'
-        }
-
-        if 'username' not in session:
-            log_ctx['status_code'] = 403
-            log_ctx['response_time'] = int((time.time() - start_time) * 1000)
-            logger.warning(f"未授权用户尝试下载文件 {filename}", extra=log_ctx)
+        if g.user is None:
+            log_warning(f"未授权用户尝试下载文件 {filename}", status_code=403)
             abort(403)
 
         try:
-            logger.info(f"用户 {session['username']} 尝试下载文件 {filename}", extra=log_ctx)
-            response = send_from_directory(
-                directory=str(UPLOAD_FOLDER),
-                path=filename,
-                as_attachment=True
-            )
-            log_ctx['response_time'] = int((time.time() - start_time) * 1000)
-            logger.info(f"用户 {session['username']} 下载文件 {filename} 成功", extra=log_ctx)
+            log_info(f"用户 {g.user} 尝试下载文件 {filename}")
+            if X_ACCEL_REDIRECT_PREFIX:
+                # 交由Nginx发送文件内容
+                response = build_accel_redirect_response(filename)
+            else:
+                response = send_from_directory(
+                    directory=str(UPLOAD_FOLDER),
+                    path=filename,
+                    as_attachment=True
+                )
+            log_info(f"用户 {g.user} 下载文件 {filename} 成功")
             return response
         except FileNotFoundError:
-            log_ctx['status_code'] = 404
-            log_ctx['response_time'] = int((time.time() - start_time) * 1000)
-            logger.warning(f"文件 {filename} 不存在", extra=log_ctx)
+            log_warning(f"文件 {filename} 不存在", status_code=404)
             abort(404)
         except Exception as e:
-            log_ctx['status_code'] = 500
-            log_ctx['response_time'] = int((time.time() - start_time) * 1000)
-            logger.error(f"下载文件 {filename} 时系统错误: {str(e)}", extra=log_ctx)
+            log_error(f"下载文件 {filename} 时系统错误: {str(e)}", status_code=500)
             abort(500)
 
+    # 静态页面（启动时渲染一次，按ETag支持304协商缓存）
+    static_pages = {}
+
+    def static_page_response(template):
+        body, etag = static_pages[template]
+        response = Response(body, mimetype='text/html')
+        response.set_etag(etag)
+        response.cache_control.public = True
+        response.cache_control.max_age = STATIC_PAGE_MAX_AGE
+        return response.make_conditional(request)
+
     @app.route('/privacy')
     def privacy():
         """隐私政策页面"""
-        logger.info("访问隐私政策页面", extra={
-            'method': request.method,
-            'path': request.path,
-            'status_code': 200,
-            'client_ip': request.remote_addr or '-'
-        })
-        return render_template('privacy.html')
+        log_info("访问隐私政策页面", status_code=200)
+        return static_page_response('privacy.html')
 
     @app.route('/support')
     def support():
         """支持页面"""
-        logger.info("访问支持页面", extra={
-            'method': request.method,
-            'path': request.path,
-            'status_code': 200,
-            'client_ip': request.remote_addr or '-'
-        })
-        return render_template('support.html')
+        log_info("访问支持页面", status_code=200)
+        return static_page_response('support.html')
 
     @app.route('/full_analysis.html')
     def full_analysis():
-        start_time = time.time()
-        log_ctx = {
-            'status_code': 200,
-            'response_time': 0,
-            'method': request.method,
-            'path': request.path,
-            'client_ip': request.remote_addr or '-'
-        }
-        logger.info("开始处理完整分析报告页面请求", extra=log_ctx)
         try:
             # 直接返回静态文件，不通过模板引擎
-            return send_from_directory(
-                directory=str(PathManager.get_web_folder()),
-                path='full_analysis.html'
+            response = send_from_directory(
+                directory=str(WEB_FOLDER),
+                path='full_analysis.html',
+                max_age=STATIC_PAGE_MAX_AGE
             )
         except Exception as e:
-            log_ctx['status_code'] = 500
-            log_ctx['response_time'] = int((time.time() - start_time) * 1000)
-            logger.error(f"加载完整分析报告失败: {str(e)}", extra=log_ctx)
+            log_error(f"加载完整分析报告失败: {str(e)}", status_code=500)
             abort(500)
-        finally:
-            log_ctx['response_time'] = int((time.time() - start_time) * 1000)
-            logger.info("完整分析报告页面请求处理完成", extra=log_ctx)
+        log_info("完整分析报告页面请求处理完成")
+        return response
+
+    # 日志分析报告（按日志文件状态缓存，目录取自启动时解析好的路径常量）
+    logs_dir = LOG_FOLDER
+    web_dir = WEB_FOLDER
+    web_dir.mkdir(exist_ok=True)
+    report_cache = LogReportCache(
+        log_files={
+            'access': logs_dir / 'access.log',
+            'application': logs_dir / 'application.log',
+            'error': logs_dir / 'error.log'
+        },
+        report_path=web_dir / 'report.html',
+        state_path=logs_dir / '.report_state.json'
+    )
+    logging.info(f"日志分析目录: {logs_dir}，报告目录: {web_dir}")
 
     @app.route('/logs')
     def log_analysis():
-        """优化后的日志分析路由"""
-        start_time = time.time()
-        log_ctx = {
-            'status_code': 200,
-            'client_ip': request.remote_addr or '-',
-            'response_time': lambda: int((time.time() - start_time) * 1000)
-        }
-        logger.info("开始处理日志分析请求", extra=log_ctx)
-        if 'username' not in session:
-            log_ctx['status_code'] = 302
-            log_ctx['response_time'] = int((time.time() - start_time) * 1000)
-            logger.info("未登录用户重定向到登录页面", extra=log_ctx)
+        """优化后的日志分析路由（每个请求只记录一条汇总日志）"""
+        if g.user is None:
+            log_info("未登录用户访问日志分析，重定向到登录页面", status_code=302)
             return redirect(url_for('login'))
 
         try:
-            # 获取项目根目录路径
-            if getattr(sys, 'frozen', False):
-                base_dir = Path(sys.executable).parent
+            # 日志未变化时复用已生成的报告，仅追加时增量解析
+            if report_cache.refresh():
+                phases = ', '.join(f"{name} {ms}ms" for name, ms in report_cache.phases.items())
+                summary = f"日志分析和报告生成完成（{phases}）"
             else:
-                base_dir = Path(__file__).parent
-
-            logs_dir = base_dir / 'logs'
-            web_dir = base_dir / 'web'
-            logger.info(f"项目根目录: {base_dir}", extra=log_ctx)
-            logger.info(f"日志目录: {logs_dir}", extra=log_ctx)
-            logger.info(f"Web目录: {web_dir}", extra=log_ctx)
-
-            # 确保web目录存在
-            web_dir.mkdir(exist_ok=True)
-            logger.info("Web目录已确保存在", extra=log_ctx)
-
-            # 初始化分析器
-            analyzer = AdvancedLogAnalyzer()
-            logger.info("日志分析器已初始化", extra=log_ctx)
-
-            # 定义日志文件路径
-            log_files = {
-                'access.log': logs_dir / 'access.log',
-                'application.log': logs_dir / 'application.log',
-                'error.log': logs_dir / 'error.log'
-            }
-            logger.info("日志文件路径已定义", extra=log_ctx)
-
-            # 解析日志文件
-            for log_type, file_path in log_files.items():
-                if file_path.exists():
-                    logger.info(f"开始解析 {log_type} 文件", extra=log_ctx)
-                    with open(file_path, 'r', encoding='utf-8') as f:
-                        for line in f:
-                            line = line.strip()
-                            if log_type == 'access.log':
-                                analyzer.parse_access_log(line)
-                            elif log_type == 'application.log':
-                                analyzer.parse_application_log(line)
-                            elif log_type == 'error.log':
-                                analyzer.parse_error_log(line)
-                    logger.info(f"{log_type} 文件解析完成", extra=log_ctx)
-                else:
-                    logger.warning(f"{log_type} 文件不存在", extra=log_ctx)
-
-            # 分析并生成报告
-            logger.info("开始分析日志并生成报告", extra=log_ctx)
-            analyzer.analyze_logs()
-            analyzer.generate_visualizations()
-            analyzer.generate_report()
-            logger.info("日志分析和报告生成完成", extra=log_ctx)
+                summary = "日志未变化，复用已生成的分析报告"
 
             # 返回报告文件
             response = send_from_directory(
@@ -747,77 +1022,104 @@ def setup_routes(app):
                 path='report.html',
                 as_attachment=False
             )
-            log_ctx['response_time'] = int((time.time() - start_time) * 1000)
-            logger.info("日志分析报告已返回", extra=log_ctx)
+            log_info(f"{summary}，报告已返回")
             return response
 
         except Exception as e:
-            log_ctx['status_code'] = 500
-            log_ctx['response_time'] = int((time.time() - start_time) * 1000)
-            logger.error(f"日志分析失败: {str(e)}", extra=log_ctx)
+            log_error(f"日志分析失败: {str(e)}", status_code=500)
             abort(500)
 
-    # 错误处理路由
+    # 错误处理路由（错误页内容固定，启动时渲染一次后直接返回字节）
+    error_pages = {}
+
     @app.errorhandler(404)
     def page_not_found(error):
-        logger.error(f"404 Error: {error}", extra={
-            'method': request.method,
-            'path': request.path,
-            'status_code': 404,
-            'client_ip': request.remote_addr or '-'
-        })
-        return render_template('error.html', code=404, message='The requested page does not exist'), 404
+        log_error(f"404 Error: {error}", status_code=404)
+        return Response(error_pages[404], status=404, mimetype='text/html')
 
     @app.errorhandler(403)
     def forbidden(error):
-        logger.error(f"403 Error: {error}", extra={
-            'method': request.method,
-            'path': request.path,
-            'status_code': 403,
-            'client_ip': request.remote_addr or '-'
-        })
-        return render_template('error.html', code=403, message='Access to this page is prohibited'), 403
+        log_error(f"403 Error: {error}", status_code=403)
+        return Response(error_pages[403], status=403, mimetype='text/html')
 
     @app.errorhandler(500)
     def internal_error(error):
-        logger.error(f"500 Error: {error}", extra={
-            'method': request.method,
-            'path': request.path,
-            'status_code': 500,
-            'client_ip': request.remote_addr or '-'
-        })
-        return render_template('error.html', code=500, message='Internal Server Error'), 500
+        log_error(f"500 Error: {error}", status_code=500)
+        return Response(error_pages[500], status=500, mimetype='text/html')
+
+    for template in ('index.html', 'login.html'):
+        templates[template] = app.jinja_env.get_template(template)
+
+    # 模板中使用了url_for，需在请求上下文中预渲染
+    with app.test_request_context('/'):
+        for code, message in (
+                (404, 'The requested page does not exist'),
+                (403, 'Access to this page is prohibited'),
+                (500, 'Internal Server Error')
+        ):
+            error_pages[code] = render_template('error.html', code=code, message=message).encode('utf-8')
+        for template in ('privacy.html', 'support.html'):
+            body = render_template(template).encode('utf-8')
+            static_pages[template] = (body, hashlib.blake2b(body, digest_size=8).hexdigest())
+            export_static_page(template, body)
 
     logging.info("应用路由配置完成")
 
 
-def find_available_port(host, base_port, max_attempts):
+def find_available_port(host, base_port):
     """
-    可用端口查找函数（修复后版本）
+    可用端口查找函数
     参数：
     - host: 主机名或IP地址
-    - base_port: 起始端口号
-    - max_attempts: 最大尝试次数
+    - base_port: 首选端口号
     返回：
-    - 找到的可用端口号
+    - 找到的可用端口号（首选端口被占用时由系统分配空闲端口）
     异常：
-    - 如果在指定范围内找不到可用端口，抛出异常
+    - 端口检测出现非占用类错误时抛出 RuntimeError
     """
-    for port in range(base_port, base_port + max_attempts):
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        # 与开发服务器一致设置 SO_REUSEADDR，避免 TIME_WAIT 残留导致误判为占用
+        # （Windows 上该选项允许抢占正在使用的端口，因此不设置）
+        if os.name != 'nt':
+            s.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
         try:
-            # 创建临时 socket 检测端口是否可用
-            with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-                s.bind((host, port))
-                logging.info(f"   - 找到可用端口 {port}")
-                return port
+            s.bind((host, base_port))
         except socket.error as e:
             # 兼容Linux和Windows错误码
-            if e.errno in (98, 10048):  # 端口已占用
-                logging.warning(f"   - 端口 {port} 已被占用，尝试下一个端口")
-                continue
-            else:
+            if e.errno not in (98, 10048):  # 端口已占用
                 raise RuntimeError(f"端口检测错误: {str(e)}")
-    raise RuntimeError(f"无法找到可用端口（尝试范围：{base_port}-{base_port + max_attempts - 1}）")
+            logging.warning(f"   - 端口 {base_port} 已被占用，由系统分配空闲端口")
+            # 绑定0端口，由内核一次性分配空闲端口，无需逐个探测
+            s.bind((host, 0))
+        port = s.getsockname()[1]
+    logging.info(f"   - 找到可用端口 {port}")
+    return port
+
+
+def get_local_ips(port, timeout=1.0):
+    """
+    获取本机IPv4地址（用于启动信息展示）
+    参数：
+    - port: 服务端口
+    - timeout: 名称解析最长等待秒数，超时返回空列表
+    返回：
+    - 去重后的IP地址列表
+    说明：
+    - getaddrinfo 不受 socket 超时设置影响，因此在守护线程中解析，避免DNS异常时阻塞启动
+    """
+    result = []
+
+    def resolve():
+        infos = socket.getaddrinfo(socket.gethostname(), port, socket.AF_INET, socket.SOCK_STREAM)
+        result.extend(dict.fromkeys(info[4][0] for info in infos))
+
+    resolver = threading.Thread(target=resolve, daemon=True)
+    resolver.start()
+    resolver.join(timeout)
+    if resolver.is_alive():
+        logging.warning(f"      - 主机名解析超过 {timeout} 秒，跳过网络地址展示")
+        return []
+    return result
 
 
 def configure_ssl_context():
@@ -827,9 +1129,9 @@ def configure_ssl_context():
     - SSL上下文对象或None
     - 协议字符串（http或https）
     """
-    cert_folder = PathManager.get_cert_folder()
-    cert_file = PathManager.get_cert_file()
-    key_file = PathManager.get_cert_key()
+    cert_folder = SSL_FOLDER
+    cert_file = SSL_CERT
+    key_file = SSL_KEY
 
     logging.info(f"   - 证书检测:")
     logging.info(f"      - 证书目录: {os.path.relpath(str(cert_folder))}")
@@ -847,10 +1149,41 @@ def configure_ssl_context():
     return ssl_context, protocol
 
 
+def exec_gunicorn(host, port):
+    """
+    以gunicorn多进程+gevent协程模式替换当前进程
+    工作进程数与类型见 gunicorn.conf.py，应用在 wsgi.py 中初始化
+    """
+    base_dir = os.path.dirname(os.path.abspath(__file__))
+    args = [
+        'gunicorn',
+        '--chdir', base_dir,
+        '-c', os.path.join(base_dir, 'gunicorn.conf.py'),
+        '-b', f"{host}:{port}"
+    ]
+    cert_file = SSL_CERT
+    key_file = SSL_KEY
+    if cert_file.exists() and key_file.exists():
+        args += ['--certfile', str(cert_file), '--keyfile', str(key_file)]
+    args.append('wsgi:application')
+    os.execvp('gunicorn', args)
+
+
 # ======================
 # 主程序入口
 # ======================
 if __name__ == '__main__':
+    # 打包后的可执行文件中，日志解析子进程（spawn）由此进入子进程入口
+    multiprocessing.freeze_support()
+
+    # 生产模式（PCS_PROD=1）：开发服务器同一时间只能处理一个请求，改由gunicorn托管
+    if os.getenv('PCS_PROD') == '1':
+        try:
+            exec_gunicorn('0.0.0.0', find_available_port('0.0.0.0', 5000))
+        except (RuntimeError, OSError) as e:
+            print(f"生产模式启动失败: {str(e)}", file=sys.stderr)
+            sys.exit(1)
+
     setup_logging()
     initialize_system()
     app = initialize_flask_app()
@@ -862,11 +1195,10 @@ if __name__ == '__main__':
 
     host = '0.0.0.0'
     base_port = 5000
-    max_attempts = 100
 
     try:
         # 自动查找可用端口
-        port = find_available_port(host, base_port, max_attempts)
+        port = find_available_port(host, base_port)
         if port is None:
             logging.error("启动失败：无法找到可用端口")
             sys.exit(1)
@@ -876,10 +1208,9 @@ if __name__ == '__main__':
 
         # 显示启动信息
         try:
-            hostname = socket.gethostname()
             logging.info(f"   - 应用程序已在：{protocol}://{host}:{port} 启动，访问地址如下：")
             logging.info(f"      - 本地：{protocol}://127.0.0.1:{port}")
-            for ip in socket.gethostbyname_ex(hostname)[2]:
+            for ip in get_local_ips(port):
                 if ip != '127.0.0.1':
                     logging.info(f"      - 网络：{protocol}://{ip}:{port}")
         except Exception as e:
@@ -892,9 +1223,6 @@ if __name__ == '__main__':
         werkzeug_log.setLevel(logging.WARNING)
         werkzeug_log.addHandler(logging.StreamHandler())
 
-        # 创建应用日志器
-        logger = RequestLoggerAdapter(logging.getLogger('app'), {})
-
         # 启动应用
         app.run(
             host=host,
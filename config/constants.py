@@ -21,16 +21,57 @@ ASSETS_FOLDER = PathManager.get_assets_folder()  # CDN缓存目录，加速资
 SSL_FOLDER = PathManager.get_cert_folder()  # SSL证书存储目录，确保通信安全。
 SSL_CERT = PathManager.get_cert_file()  # SSL证书文件路径，用于HTTPS配置。
 SSL_KEY = PathManager.get_cert_key()  # SSL密钥文件路径，用于HTTPS配置。
+STATIC_PAGES_FOLDER = WEB_FOLDER / 'static'  # 启动时预渲染的静态页面输出目录，可由Nginx直接发送。
+JINJA_CACHE_FOLDER = BASE_DIR / '.jinja_cache'  # 模板字节码缓存目录，进程重启后无需重新解析编译模板。
+
+
+def _load_session_secret():
+    """
+    加载持久化的会话密钥，保证多进程部署和重启后会话仍然有效。
+    优先使用环境变量 SESSION_SECRET，其次读取项目根目录下的 .session_key 文件，
+    都不存在时生成新密钥并以 0600 权限写入该文件（通过硬链接原子创建，多进程并发启动时只有一个密钥生效）。
+    """
+    secret = os.getenv('SESSION_SECRET')
+    if secret:
+        return secret.encode('utf-8')
+
+    key_file = os.path.join(BASE_DIR, '.session_key')
+    if not os.path.exists(key_file):
+        tmp_file = f"{key_file}.{os.getpid()}"
+        fd = os.open(tmp_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, 'wb') as f:
+            f.write(os.urandom(24))
+        try:
+            os.link(tmp_file, key_file)
+        except FileExistsError:
+            pass
+        finally:
+            os.remove(tmp_file)
+
+    with open(key_file, 'rb') as f:
+        return f.read()
+
 
 # ============================= 安全与访问控制配置 =============================
 # 配置系统安全策略，防止恶意攻击和资源滥用。
 ALLOWED_EXTENSIONS = {'jpg', 'jpeg', 'png', 'pdf', 'docx', 'xlsx'}  # 允许上传的文件类型白名单，确保文件合法性。
-HIGH_RISK_EXTENSIONS = {
+HIGH_RISK_EXTENSIONS = frozenset({
     'exe', 'bat', 'sh', 'dll', 'js',
     'vbs', 'cmd', 'ps1', 'jar', 'apk', 'scr'
-}  # 高危文件类型黑名单，防止恶意文件上传。
+})  # 高危文件类型黑名单（小写、不含点，不可变集合），防止恶意文件上传。
 MAX_CONTENT_LENGTH = 1024 * 1024 * 1024 * 10  # 单文件最大上传限制为10GB，防止资源耗尽。
-SESSION_SECRET = os.urandom(24)  # 动态生成会话密钥，保障用户会话安全，防止会话劫持。
+BCRYPT_ROUNDS = int(os.getenv('BCRYPT_ROUNDS', 12))  # bcrypt密码哈希成本因子（2^N轮），按单次哈希约250ms调整安全性与登录吞吐。
+SESSION_SECRET = _load_session_secret()  # 持久化会话密钥，多进程共享且重启后会话不失效，防止会话劫持。
+TRUSTED_PROXY_HOPS = int(os.getenv('TRUSTED_PROXY_HOPS', 0))  # 应用前可信反向代理（Nginx等）的层数，大于0时按X-Forwarded-*还原客户端IP，直连部署须保持0以防伪造。
+SESSION_REDIS_URL = os.getenv('SESSION_REDIS_URL', '')  # 服务端会话存储的Redis地址（如 redis://127.0.0.1:6379/0），为空时使用签名Cookie会话。
+VERIFICATION_REDIS_URL = os.getenv('VERIFICATION_REDIS_URL', SESSION_REDIS_URL)  # 验证码存储的Redis地址，默认与会话共用，为空时存入数据库。
+UPLOAD_CHUNK_SIZE = 1024 * 1024  # 上传文件落盘的分块大小（1MB），大文件写入时减少系统调用次数。
+
+# ============================= 文件下载加速配置 =============================
+# 配置由前置代理直接发送文件（sendfile零拷贝），Python进程只负责鉴权并返回响应头。
+USE_X_SENDFILE = os.getenv('USE_X_SENDFILE', '0') == '1'  # Apache/lighttpd 部署时启用，返回 X-Sendfile 响应头。
+X_ACCEL_REDIRECT_PREFIX = os.getenv('X_ACCEL_REDIRECT_PREFIX', '')  # Nginx internal location 前缀（如 /_protected/），为空时不启用。
+STATIC_PAGE_MAX_AGE = int(os.getenv('STATIC_PAGE_MAX_AGE', 86400))  # 隐私政策等固定页面的浏览器缓存时长（秒），默认1天。
 
 # ============================= 数据生命周期配置 =============================
 # 配置数据清理和保留策略，优化存储资源利用率。
@@ -47,7 +88,12 @@ DB_CONFIG = {
     'database': os.getenv('DB_NAME', 'XXX'),  # 数据库名称，默认为file_sharing。
     'charset': 'utf8mb4',  # 数据库字符集，支持多语言字符。
     'autocommit': True,  # 是否自动提交事务，提升性能。
-    'pool_size': 5,  # 数据库连接池大小，默认为5个连接。
+    'pool_size': int(os.getenv('DB_POOL_SIZE', 25)),  # 连接池常驻空闲连接上限，默认为25个连接。
+    'min_cached': int(os.getenv('DB_POOL_MIN_CACHED', 5)),  # 启动时预建的空闲连接数。
+    'max_overflow': int(os.getenv('DB_POOL_MAX_OVERFLOW', 25)),  # 高峰期允许超出常驻连接的临时连接数。
+    'pool_blocking': True,  # 连接数达到上限时排队等待而非报错。
+    'pool_ping': 1,  # 从池中取出连接时检测可用性，避免使用已断开的连接后再重试。
+    'wait_timeout': int(os.getenv('DB_WAIT_TIMEOUT', 28800)),  # 会话空闲超时（秒），避免池中空闲连接被服务端提前断开后重新握手。
     'pool_name': 'main_pool'  # 数据库连接池名称，便于监控和管理。
 }
 
@@ -9,15 +9,38 @@
 """
 
 # 标准库导入
+import hmac
 import logging
 import re
+import secrets
+import threading
+import time
 from datetime import datetime, timedelta, timezone
 from typing import Optional, Tuple
 
 # 第三方库导入
 import bcrypt  # 密码哈希库
 
+try:
+    import redis  # 可选依赖：配置 VERIFICATION_REDIS_URL 时验证码存入Redis
+except ImportError:
+    redis = None
+
+try:
+    from argon2 import PasswordHasher  # 可选依赖：安装后新密码使用argon2id哈希
+    from argon2.exceptions import InvalidHashError, VerificationError
+except ImportError:
+    PasswordHasher = None
+
+try:
+    import gevent  # gunicorn gevent工作模式下使用hub的原生线程池执行bcrypt
+    from gevent import monkey
+except ImportError:
+    gevent = monkey = None
+
 # 本地库导入
+from config.constants import BCRYPT_ROUNDS, VERIFICATION_REDIS_URL
+from core.email_sender import EmailSender
 from mapper.db import Database
 
 # 初始化独立安全日志记录器（与系统其他日志分离）
@@ -25,9 +48,38 @@ logger = logging.getLogger('auth')
 logger.setLevel(logging.DEBUG)
 
 # 用户名正则验证：4-20位字母/数字/下划线的任意组合，不能以数字或下划线开头
+# 注：当前登录与注册均以邮箱作为用户名，登录路径不使用该规则校验，仅保留作为用户名格式规范
 USERNAME_PATTERN = re.compile(r'^[a-zA-Z][a-zA-Z0-9_]{3,19}$')
+# 密码哈希前缀：argon2（$argon2id$ 等）与 bcrypt（$2a$/$2b$/$2y$）；不含 '$' 的存量密码视为历史明文，其余格式一律拒绝
+ARGON2_PREFIX = '$argon2'
+BCRYPT_PREFIX = '$2'
+# 验证码有效期（秒）
+VERIFICATION_CODE_TTL = 300
+# 同一邮箱在该时长（秒）内重复请求时直接返回已发送的验证码，不再写库和发信
+VERIFICATION_CODE_RESEND_INTERVAL = 60
+# 同一IP在统计窗口（秒）内最多请求验证码的次数
+VERIFICATION_CODE_IP_LIMIT = 10
+VERIFICATION_CODE_IP_WINDOW = 3600
+# 未配置Redis时限流记录保存在各工作进程内，多进程部署下实际上限约为配置值乘以工作进程数
+# 进程内限流记录的最大条目数，超过时清除已过期的条目
+VERIFICATION_THROTTLE_MAX_ENTRIES = 10_000
 # 密码正则验证：8-32位字母/数字/下划线/特殊符号的任意组合，不能以数字或下划线开头
 PASSWORD_PATTERN = re.compile(r'^[a-zA-Z][a-zA-Z0-9_!@#$%^&*]{7,31}$')
+# 邮箱格式验证
+EMAIL_PATTERN = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+
+
+def _run_hash(func, *args):
+    """执行CPU密集的密码哈希运算
+
+    bcrypt与argon2的C实现均会释放GIL：多线程服务器下直接调用即可多核并行；
+    gevent协程模式下交给hub的原生线程池执行，避免阻塞同一进程内的其他请求。
+    哈希前先归还请求绑定的数据库连接，数百毫秒的哈希运算期间不占用池连接。
+    """
+    Database.return_connection()
+    if monkey is not None and monkey.is_module_patched('threading'):
+        return gevent.get_hub().threadpool.apply(func, args)
+    return func(*args)
 
 
 class AuthenticationError(Exception):
@@ -54,8 +106,26 @@ class AuthManager:
         """
         self.lock_duration = lock_duration
         self.max_attempts = max_attempts
+        self._argon2 = PasswordHasher() if PasswordHasher is not None else None
+        # 用户不存在时校验的占位哈希（随机口令，不可能匹配），使响应时间与用户存在时一致
+        self._phantom_hash = self.hash_password(secrets.token_urlsafe(32))
+        self._code_store = self._init_code_store()
+        # 进程内验证码限流记录：邮箱 -> (验证码, 发送时间)，IP -> (窗口起始时间, 请求次数)
+        self._recent_codes = {}
+        self._ip_requests = {}
+        self._throttle_lock = threading.Lock()
         self._init_db()
 
+    @staticmethod
+    def _init_code_store():
+        """初始化验证码的Redis存储，未配置或未安装redis时返回 None（使用数据库存储）"""
+        if not VERIFICATION_REDIS_URL:
+            return None
+        if redis is None:
+            logger.warning("未安装 redis，验证码继续存储在数据库中")
+            return None
+        return redis.Redis.from_url(VERIFICATION_REDIS_URL, decode_responses=True)
+
     def _init_db(self):
         """初始化数据库表结构"""
         create_table_sql = """
@@ -74,27 +144,27 @@ class AuthManager:
         :param username: 用户名
         :return: 用户数据字典，若用户不存在则返回 None
         """
-        query = "SELECT * FROM users WHERE username = %s"
+        # lock_time 以UTC秒级时间戳（整数）返回，锁定判断只做整数比较
+        query = """
+        SELECT username, password, email, attempts,
+               TIMESTAMPDIFF(SECOND, '1970-01-01', lock_time) AS lock_time
+        FROM users WHERE username = %s
+        """
         result = Database.execute_query(query, (username.upper(),))
         return result[0] if result else None
 
-    def _save_user(self, user_data: dict) -> None:
-        """原子化更新用户数据
+    def _update_login_state(self, username: str, attempts: int, lock_time) -> None:
+        """按用户名更新登录失败次数与锁定时间（仅更新这两列）
 
-        :param user_data: 用户数据字典
+        :param username: 用户名
+        :param attempts: 失败尝试次数
+        :param lock_time: 锁定时间（UTC秒级时间戳），None 表示未锁定
         """
         query = """
-        INSERT INTO users 
-            (username, password, email, attempts, lock_time)
-        VALUES 
-            (%(username)s, %(password)s, %(email)s, %(attempts)s, %(lock_time)s)
-        ON DUPLICATE KEY UPDATE
-            password = VALUES(password),
-            email = VALUES(email),
-            attempts = VALUES(attempts),
-            lock_time = VALUES(lock_time)
-        """
-        Database.execute_query(query, user_data)
+        UPDATE users SET attempts = %s, lock_time = TIMESTAMPADD(SECOND, %s, '1970-01-01')
+        WHERE username = %s
+        """
+        Database.execute_query(query, (attempts, lock_time, username))
 
     def validate_credentials(self, username: str, password: str) -> Tuple[bool, Optional[str]]:
         """验证用户凭据
@@ -107,62 +177,168 @@ class AuthManager:
         user_data = self._load_user(clean_user)
 
         if not user_data:
-            return False, "用户不存在"
+            # 同样执行一次完整的哈希校验，避免通过响应时间枚举用户名
+            self._verify_password(clean_user, self._phantom_hash, password)
+            return False, "用户名或密码错误"
 
-        # 账户锁定检查
-        if self._is_locked(user_data):
-            remain_sec = self._remaining_lock_time(user_data)
+        # 账户锁定检查（锁定状态与剩余时间一次算出）
+        locked, remain_sec = self._lock_status(user_data, time.time())
+        if locked:
             return False, f"账户已锁定，请{remain_sec}秒后重试"
 
         # 密码验证
-        hashed_password = user_data['password'].encode('utf-8')
-        if not bcrypt.checkpw(password.encode('utf-8'), hashed_password):
-            user_data['attempts'] += 1
-            if user_data['attempts'] >= self.max_attempts:
-                user_data['lock_time'] = datetime.now(timezone.utc)
-                user_data['attempts'] = 0
-            self._save_user(user_data)
-            return False, "密码错误"
-
-        # 登录成功重置状态
-        user_data['attempts'] = 0
-        user_data['lock_time'] = None
-        self._save_user(user_data)
+        if not self._verify_password(clean_user, user_data['password'], password):
+            attempts = user_data['attempts'] + 1
+            lock_time = user_data['lock_time']
+            if attempts >= self.max_attempts:
+                lock_time = int(time.time())
+                attempts = 0
+            self._update_login_state(clean_user, attempts, lock_time)
+            return False, "用户名或密码错误"
+
+        # 登录成功重置状态（状态本已干净时不再回写数据库）
+        if user_data['attempts'] or user_data['lock_time'] is not None:
+            self._update_login_state(clean_user, 0, None)
         return True, None
 
-    def generate_verification_code(self, email: str) -> str:
+    def _verify_password(self, username: str, stored: str, password: str) -> bool:
+        """校验密码，兼容bcrypt哈希与迁移前以明文存储的密码
+
+        只有不含 '$'（不可能是哈希）的存量值按明文以恒定时间比较，其他无法识别的格式记录日志并拒绝，
+        避免取得任意格式存储值的人直接提交该值登录；旧格式或参数过时的哈希校验通过后立即改写为当前哈希。
+
+        :param username: 用户名
+        :param stored: 数据库中存储的密码
+        :param password: 用户输入的密码
+        :return: 密码是否正确
+        """
+        if stored.startswith(ARGON2_PREFIX):
+            if self._argon2 is None:
+                logger.error("检测到argon2密码哈希，但未安装 argon2-cffi", extra={'username': username})
+                return False
+            try:
+                _run_hash(self._argon2.verify, stored, password)
+            except (VerificationError, InvalidHashError):
+                return False
+            needs_rehash = self._argon2.check_needs_rehash(stored)
+        elif stored.startswith(BCRYPT_PREFIX):
+            if not _run_hash(bcrypt.checkpw, password.encode('utf-8'), stored.encode('utf-8')):
+                return False
+            needs_rehash = self._argon2 is not None
+        elif '$' not in stored:
+            if not hmac.compare_digest(stored.encode('utf-8'), password.encode('utf-8')):
+                return False
+            needs_rehash = True
+        else:
+            logger.error("无法识别的密码存储格式，拒绝登录", extra={'username': username})
+            return False
+
+        if needs_rehash:
+            Database.execute_query(
+                "UPDATE users SET password = %s WHERE username = %s",
+                (self.hash_password(password), username)
+            )
+            logger.info("用户密码已迁移为当前哈希格式", extra={'username': username})
+        return True
+
+    def _throttle(self, email: str, client_ip: Optional[str], now: float) -> Optional[str]:
+        """验证码请求限流
+
+        :param email: 用户邮箱
+        :param client_ip: 客户端IP，为 None 时不做IP限流
+        :param now: 当前单调时钟时间
+        :return: 该邮箱最近仍在重发间隔内的验证码，没有则返回 None
+        """
+        if self._code_store is not None:
+            return self._throttle_shared(email, client_ip)
+        with self._throttle_lock:
+            recent = self._recent_codes.get(email)
+            if recent is not None and now - recent[1] < VERIFICATION_CODE_RESEND_INTERVAL:
+                return recent[0]
+
+            if client_ip is not None:
+                window_start, count = self._ip_requests.get(client_ip, (now, 0))
+                if now - window_start >= VERIFICATION_CODE_IP_WINDOW:
+                    window_start, count = now, 0
+                if count >= VERIFICATION_CODE_IP_LIMIT:
+                    raise AuthenticationError("验证码请求过于频繁，请稍后再试")
+                self._ip_requests[client_ip] = (window_start, count + 1)
+                if len(self._ip_requests) > VERIFICATION_THROTTLE_MAX_ENTRIES:
+                    self._ip_requests = {ip: v for ip, v in self._ip_requests.items()
+                                         if now - v[0] < VERIFICATION_CODE_IP_WINDOW}
+        return None
+
+    def _throttle_shared(self, email: str, client_ip: Optional[str]) -> Optional[str]:
+        """验证码请求限流（计数保存在Redis中，所有工作进程共享）
+
+        :param email: 用户邮箱
+        :param client_ip: 客户端IP，为 None 时不做IP限流
+        :return: 该邮箱最近仍在重发间隔内的验证码，没有则返回 None
+        """
+        recent_code = self._code_store.get(f'vc:recent:{email}')
+        if recent_code is not None:
+            return recent_code
+
+        if client_ip is not None:
+            key = f'vc:ip:{client_ip}'
+            # 窗口内首次请求时设置过期时间，窗口到期后计数自动清除
+            count = self._code_store.incr(key)
+            if count == 1:
+                self._code_store.expire(key, VERIFICATION_CODE_IP_WINDOW)
+            if count > VERIFICATION_CODE_IP_LIMIT:
+                raise AuthenticationError("验证码请求过于频繁，请稍后再试")
+        return None
+
+    def generate_verification_code(self, email: str, client_ip: Optional[str] = None) -> str:
         """生成并存储验证码
 
         :param email: 用户邮箱
+        :param client_ip: 客户端IP，用于限制同一IP的请求频率
         :return: 生成的验证码
         """
-        from core.email_sender import EmailSender
-        import random
-
         # 验证邮箱格式
-        if not re.match(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$', email):
+        if not EMAIL_PATTERN.match(email):
             raise AuthenticationError("无效的邮箱格式")
 
-        # 生成6位数字验证码
-        code = ''.join(random.choices('0123456789', k=6))
-        expires_at = datetime.now(timezone.utc) + timedelta(minutes=5)
-
-        # 存储到数据库
-        query = """
-        INSERT INTO verification_codes 
-        (email, code, expires_at)
-        VALUES (%s, %s, %s)
-        ON DUPLICATE KEY UPDATE
-            code = VALUES(code),
-            expires_at = VALUES(expires_at)
-        """
-        Database.execute_query(query, (email, code, expires_at))
-
-        # 发送邮件
-        try:
-            EmailSender.send_verification_code(email, code)
-        except Exception as e:
-            raise AuthenticationError(str(e))
+        # 重发间隔内的重复请求直接返回已发送的验证码；超出IP频率限制时抛出异常
+        now = time.monotonic()
+        recent_code = self._throttle(email, client_ip, now)
+        if recent_code is not None:
+            return recent_code
+
+        # 生成6位数字验证码（使用密码学安全随机数，验证码不可预测）
+        code = f"{secrets.randbelow(1_000_000):06d}"
+
+        if self._code_store is not None:
+            # SET EX 写入，过期由Redis自动清理，多个工作进程共享；重发间隔记录随验证码一次往返写入
+            pipe = self._code_store.pipeline(transaction=False)
+            pipe.set(f'vc:{email}', code, ex=VERIFICATION_CODE_TTL)
+            pipe.set(f'vc:recent:{email}', code, ex=VERIFICATION_CODE_RESEND_INTERVAL)
+            pipe.execute()
+        else:
+            expires_at = datetime.now(timezone.utc) + timedelta(seconds=VERIFICATION_CODE_TTL)
+
+            # 存储到数据库
+            query = """
+            INSERT INTO verification_codes 
+            (email, code, expires_at)
+            VALUES (%s, %s, %s)
+            ON DUPLICATE KEY UPDATE
+                code = VALUES(code),
+                expires_at = VALUES(expires_at)
+            """
+            Database.execute_query(query, (email, code, expires_at))
+
+        # 发送邮件（放入后台队列异步发送，请求无需等待SMTP往返）
+        EmailSender.enqueue_verification_code(email, code)
+
+        if self._code_store is not None:
+            return code
+        with self._throttle_lock:
+            self._recent_codes[email] = (code, now)
+            if len(self._recent_codes) > VERIFICATION_THROTTLE_MAX_ENTRIES:
+                self._recent_codes = {e: v for e, v in self._recent_codes.items()
+                                      if now - v[1] < VERIFICATION_CODE_RESEND_INTERVAL}
 
         return code
 
@@ -173,6 +349,10 @@ class AuthManager:
         :param code: 验证码
         :return: 验证结果
         """
+        if self._code_store is not None:
+            stored_code = self._code_store.get(f'vc:{email}')
+            return stored_code is not None and stored_code == code
+
         query = """
         SELECT code, expires_at FROM verification_codes
         WHERE email = %s AND expires_at > UTC_TIMESTAMP()
@@ -185,49 +365,38 @@ class AuthManager:
         stored_code = result[0].get('code')
         return stored_code == code
 
-    def _is_locked(self, user_data: dict) -> bool:
-        """判断用户账户是否被锁定
+    def purge_expired_codes(self) -> None:
+        """批量删除已过期的验证码（单条DELETE，由清理调度器定期调用）
 
-        :param user_data: 包含lock_time的用户数据
-        :return: 如果账户被锁定返回 True，否则返回 False
+        验证码存入Redis时由过期时间自动清理，无需处理。
         """
-        try:
-            lock_time = user_data.get('lock_time')
-            if lock_time:
-                lock_time = datetime.fromisoformat(lock_time).astimezone(timezone.utc)
-                expiry_time = lock_time + timedelta(seconds=self.lock_duration)
-                return expiry_time > datetime.now(timezone.utc)
-            return False
-        except Exception as e:
-            logger.error("判断锁定状态失败", exc_info=True, extra={'error': str(e)})
-            return False
+        if self._code_store is not None:
+            return
+        Database.execute_query("DELETE FROM verification_codes WHERE expires_at <= UTC_TIMESTAMP()")
 
-    def _remaining_lock_time(self, user_data: dict) -> int:
-        """计算剩余锁定时间（秒）
-
-        :param user_data: 包含lock_time的用户数据
-        :return: 剩余锁定时间，单位秒（不小于0）
-        """
-        try:
-            lock_time = datetime.fromisoformat(user_data['lock_time']).astimezone(timezone.utc)
-            expiry_time = lock_time + timedelta(seconds=self.lock_duration)
-            delta = max(expiry_time - datetime.now(timezone.utc), timedelta(0))
-            remain_sec = int(delta.total_seconds())
-            logger.debug("计算剩余锁定时间", extra={
-                'lock_time': user_data['lock_time'],
-                'remaining_seconds': remain_sec
-            })
-            return remain_sec
-        except Exception as e:
-            logger.error("计算锁定时间失败", exc_info=True, extra={'error': str(e)})
-            return 0
+    def _lock_status(self, user_data: dict, now: float) -> Tuple[bool, int]:
+        """一次计算账户锁定状态与剩余锁定时间
+
+        :param user_data: 包含lock_time（UTC秒级时间戳）的用户数据
+        :param now: 当前时间戳（调用方取一次后复用）
+        :return: (是否锁定, 剩余锁定秒数)，未锁定时剩余时间为0
+        """
+        lock_time = user_data.get('lock_time')
+        if lock_time is None:
+            return False, 0
+        remaining = lock_time + self.lock_duration - now
+        if remaining <= 0:
+            return False, 0
+        return True, int(remaining)
 
     def hash_password(self, password: str) -> str:
         """对密码进行哈希处理
 
         :param password: 明文密码
-        :return: 哈希后的密码
+        :return: 哈希后的密码（已安装argon2-cffi时为argon2id，否则为bcrypt）
         """
-        salt = bcrypt.gensalt()
-        hashed = bcrypt.hashpw(password.encode('utf-8'), salt)
+        if self._argon2 is not None:
+            return _run_hash(self._argon2.hash, password)
+        salt = bcrypt.gensalt(rounds=BCRYPT_ROUNDS)
+        hashed = _run_hash(bcrypt.hashpw, password.encode('utf-8'), salt)
         return hashed.decode('utf-8')
@@ -9,8 +9,14 @@
 
 # 标准库导入
 import logging
+import queue
+import re
 import smtplib
+import threading
+import time
 from datetime import datetime
+from email import charset
+from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
 
 # 本地模块导入
@@ -18,8 +24,237 @@ from config.constants import EMAIL_CONFIG
 
 logger = logging.getLogger(__name__)
 
+# SMTP连接池：复用已登录的连接，避免每封邮件重复TCP/TLS握手和AUTH认证
+SMTP_POOL_SIZE = 4  # 最多保留的空闲连接数
+SMTP_IDLE_TIMEOUT = 60  # 空闲超过该时长（秒）的连接可能已被服务器关闭，直接丢弃重建
+
+# 后台发送队列：发送失败时按指数退避重试
+MAIL_MAX_ATTEMPTS = 3  # 每封邮件最多尝试发送次数
+MAIL_RETRY_BACKOFF = 1  # 首次重试前等待秒数，之后每次翻倍
+
+# 邮件正文以quoted-printable编码：HTML以ASCII的标签和CSS为主，比默认的base64体积更小
+_UTF8_QP = charset.Charset('utf-8')
+_UTF8_QP.body_encoding = charset.QP
+
+# 构建符合品牌视觉规范的HTML邮件内容
+# 采用现代网页设计标准，确保跨设备兼容性
+# 使用品牌主色调和渐变效果提升视觉吸引力
+# 模板在模块加载时构建一次，发送时以 format_map 填充收件人、验证码和年份（CSS 花括号已转义）
+_EMAIL_TEMPLATE = """
+<!DOCTYPE html>
+<html lang="zh-CN">
+<!-- 邮件头部信息，包含SEO优化和响应式设计 -->
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>【Peak Cloud Share】注册验证码</title>
+    <!-- 样式表采用模块化设计，便于维护和扩展 -->
+    <style>
+        /* 基础样式，确保跨平台一致性 */
+        body {{ 
+            font-family: -apple-system, BlinkMacSystemFont, "Segoe UI", Roboto, "Helvetica Neue", 
+                     Arial, "Noto Sans", "PingFang SC", "Hiragino Sans GB", sans-serif;
+            margin: 0; padding: 20px; background-color: #111827; color: #ffffff;
+            -webkit-font-smoothing: antialiased;
+        }}
+        /* 容器布局，采用最大宽度限制提升阅读体验 */
+        .container {{
+            max-width: 600px;
+            margin: 0 auto;
+        }}
+        /* 头部设计，使用品牌渐变背景提升视觉层次 */
+        .header {{ 
+            background: linear-gradient(135deg, #2563eb 0%, #1d4ed8 100%);
+            color: white;
+            padding: 28px;
+            border-radius: 12px 12px 0 0;
+            text-align: center;
+        }}
+        /* 内容区域，采用白色背景确保可读性 */
+        .content {{
+            background-color: #ffffff;
+            color: #1f2937;
+            padding: 32px;
+            border-radius: 0 0 12px 12px;
+            line-height: 1.75;
+        }}
+        /* 验证码容器，突出显示关键信息 */
+        .code-container {{
+            background: #f3f4f6;
+            border-radius: 8px;
+            padding: 20px;
+            margin: 24px 0;
+            text-align: center;
+        }}
+        /* 验证码样式，采用大字号和品牌色增强辨识度 */
+        .verification-code {{
+            color: #2563eb;
+            font-size: 32px;
+            font-weight: 700;
+            letter-spacing: 2px;
+            margin: 12px 0;
+        }}
+        /* 操作说明，采用灰色字体降低视觉干扰 */
+        .instructions {{
+            color: #6b7280;
+            font-size: 14px;
+            margin: 16px 0;
+        }}
+        /* 安全提示，采用醒目的红色背景强调重要性 */
+        .security-note {{
+            background: #fef2f2;
+            color: #dc2626;
+            padding: 12px;
+            border-radius: 6px;
+            font-size: 13px;
+            margin-top: 24px;
+        }}
+        /* 页脚信息，采用小字号和浅色字体降低视觉权重 */
+        .footer {{
+            color: #9ca3af;
+            font-size: 12px;
+            text-align: center;
+            margin-top: 32px;
+            padding-top: 16px;
+            border-top: 1px solid #e5e7eb;
+        }}
+    </style>
+</head>
+<!-- 邮件正文，采用结构化布局提升可读性 -->
+<body>
+    <div class="container">
+        <div class="header">
+            <h2 style="margin:0;font-weight:600;">PEAK CLOUD SHARE</h2>
+            <p style="margin:8px 0 0;font-size:18px;">账户激活验证</p>
+        </div>
+
+        <div class="content">
+            <p>尊敬的 {email}：</p>
+
+            <p>感谢您注册 Peak Cloud Share，请使用以下验证码完成账户验证：</p>
+
+            <div class="code-container">
+                <div class="instructions">验证码（有效期5分钟）</div>
+                <div class="verification-code">{code}</div>
+            </div>
+
+            <div class="security-note">
+                ⚠️ 安全提示：请勿向任何人泄露此验证码，包括自称平台客服的人员
+            </div>
+
+            <div class="footer">
+                <p>此邮件由系统自动发送，请勿直接回复</p>
+                <p style="margin-top:8px;">&copy; {year}-{next_year} Peak Cloud Share. All rights reserved.</p>
+            </div>
+        </div>
+    </div>
+</body>
+</html>
+"""
+# 去掉HTML/CSS注释、每行的缩进和空行，减小邮件体积（不影响HTML渲染）
+_EMAIL_TEMPLATE = re.sub(r'<!--.*?-->|/\*.*?\*/', '', _EMAIL_TEMPLATE, flags=re.S)
+_EMAIL_TEMPLATE = '\n'.join(line.strip() for line in _EMAIL_TEMPLATE.splitlines() if line.strip())
+
 
 class EmailSender:
+    # 空闲连接栈（后进先出，优先复用最近使用、最可能存活的连接），元素为 (连接, 归还时间)
+    _pool = queue.LifoQueue(maxsize=SMTP_POOL_SIZE)
+    # 待发送邮件队列及其后台发送线程（首次入队时启动，兼容gunicorn fork后的工作进程）
+    _queue = queue.Queue()
+    _worker = None
+    _worker_lock = threading.Lock()
+
+    @classmethod
+    def enqueue_verification_code(cls, email: str, code: str):
+        """将验证码邮件放入后台发送队列后立即返回"""
+        if cls._worker is None or not cls._worker.is_alive():
+            with cls._worker_lock:
+                if cls._worker is None or not cls._worker.is_alive():
+                    cls._worker = threading.Thread(target=cls._drain_queue, name='mail-sender', daemon=True)
+                    cls._worker.start()
+        cls._queue.put_nowait((email, code))
+
+    @classmethod
+    def _drain_queue(cls):
+        """后台线程：逐封发送队列中的邮件，失败时按指数退避重试"""
+        while True:
+            email, code = cls._queue.get()
+            for attempt in range(MAIL_MAX_ATTEMPTS):
+                try:
+                    cls.send_verification_code(email, code)
+                    break
+                except Exception:
+                    # 失败详情已在 send_verification_code 中记录
+                    if attempt + 1 < MAIL_MAX_ATTEMPTS:
+                        time.sleep(MAIL_RETRY_BACKOFF * 2 ** attempt)
+            else:
+                logger.error(f"验证码邮件发送 {MAIL_MAX_ATTEMPTS} 次均失败，已放弃 - 收件人: {email}")
+
+    @staticmethod
+    def _connect():
+        """建立新的SMTP SSL连接并完成登录"""
+        # 安全增强：密码强度校验（可扩展更复杂规则）
+        if len(EMAIL_CONFIG['password']) < 12:
+            raise ValueError("邮件服务密码强度不足，至少需要12位字符")
+        server = smtplib.SMTP_SSL(
+            EMAIL_CONFIG['smtp_server'],
+            EMAIL_CONFIG['smtp_port'],
+            timeout=10  # 合理设置超时时间
+        )
+        try:
+            server.login(EMAIL_CONFIG['username'], EMAIL_CONFIG['password'])
+        except BaseException:
+            EmailSender._close(server)
+            raise
+        logger.info(f"成功登录到 SMTP 服务器: {EMAIL_CONFIG['smtp_server']}")
+        return server
+
+    @staticmethod
+    def _close(server):
+        """关闭连接，忽略服务器已断开或QUIT响应异常"""
+        try:
+            server.quit()
+        except (smtplib.SMTPException, OSError):
+            server.close()
+
+    @classmethod
+    def _acquire(cls):
+        """取出一个可用连接，返回 (连接, 是否为复用的连接)"""
+        while True:
+            try:
+                server, released_at = cls._pool.get_nowait()
+            except queue.Empty:
+                return cls._connect(), False
+            if time.monotonic() - released_at < SMTP_IDLE_TIMEOUT:
+                return server, True
+            cls._close(server)
+
+    @classmethod
+    def _release(cls, server):
+        """归还连接，池已满时直接关闭"""
+        try:
+            cls._pool.put_nowait((server, time.monotonic()))
+        except queue.Full:
+            cls._close(server)
+
+    @classmethod
+    def _send(cls, email: str, message: str):
+        """通过连接池发送邮件，复用的连接已被服务器断开时重建连接重试一次"""
+        server, reused = cls._acquire()
+        try:
+            try:
+                server.sendmail(EMAIL_CONFIG['sender'], [email], message)
+            except (smtplib.SMTPServerDisconnected, ConnectionError):
+                if not reused:
+                    raise
+                cls._close(server)
+                server = cls._connect()
+                server.sendmail(EMAIL_CONFIG['sender'], [email], message)
+        except BaseException:
+            cls._close(server)
+            raise
+        cls._release(server)
+
     @staticmethod
     def send_verification_code(email: str, code: str):
         """
@@ -30,8 +265,8 @@ class EmailSender:
             code (str): 验证码（6位数字或字母组合，需配合后端生成安全校验码）
 
         功能:
-            - 构建符合品牌视觉规范的HTML邮件（背景色#111827）
-            - 采用安全的SSL/TLS加密连接传输邮件
+            - 构建符合品牌视觉规范的HTML邮件（背景色#111827），附带纯文本版本
+            - 采用安全的SSL/TLS加密连接传输邮件，已登录的连接放回连接池复用
             - 实施密码强度校验增强账户安全
             - 详细记录邮件发送日志便于审计追踪
 
@@ -41,146 +276,30 @@ class EmailSender:
             - 完善的日志记录支持运营分析和问题排查
             - 可扩展的邮件服务架构支持未来业务增长
         """
-        # 构建符合品牌视觉规范的HTML邮件内容
-        # 采用现代网页设计标准，确保跨设备兼容性
-        # 使用品牌主色调和渐变效果提升视觉吸引力
-        html_content = f"""
-        <!DOCTYPE html>
-        <html lang="zh-CN">
-        <!-- 邮件头部信息，包含SEO优化和响应式设计 -->
-        <head>
-            <meta charset="UTF-8">
-            <meta name="viewport" content="width=device-width, initial-scale=1.0">
-            <title>【Peak Cloud Share】注册验证码</title>
-            <!-- 样式表采用模块化设计，便于维护和扩展 -->
-            <style>
-                /* 基础样式，确保跨平台一致性 */
-                body {{ 
-                    font-family: -apple-system, BlinkMacSystemFont, "Segoe UI", Roboto, "Helvetica Neue", 
-                             Arial, "Noto Sans", "PingFang SC", "Hiragino Sans GB", sans-serif;
-                    margin: 0; padding: 20px; background-color: #111827; color: #ffffff;
-                    -webkit-font-smoothing: antialiased;
-                }}
-                /* 容器布局，采用最大宽度限制提升阅读体验 */
-                .container {{
-                    max-width: 600px;
-                    margin: 0 auto;
-                }}
-                /* 头部设计，使用品牌渐变背景提升视觉层次 */
-                .header {{ 
-                    background: linear-gradient(135deg, #2563eb 0%, #1d4ed8 100%);
-                    color: white;
-                    padding: 28px;
-                    border-radius: 12px 12px 0 0;
-                    text-align: center;
-                }}
-                /* 内容区域，采用白色背景确保可读性 */
-                .content {{
-                    background-color: #ffffff;
-                    color: #1f2937;
-                    padding: 32px;
-                    border-radius: 0 0 12px 12px;
-                    line-height: 1.75;
-                }}
-                /* 验证码容器，突出显示关键信息 */
-                .code-container {{
-                    background: #f3f4f6;
-                    border-radius: 8px;
-                    padding: 20px;
-                    margin: 24px 0;
-                    text-align: center;
-                }}
-                /* 验证码样式，采用大字号和品牌色增强辨识度 */
-                .verification-code {{
-                    color: #2563eb;
-                    font-size: 32px;
-                    font-weight: 700;
-                    letter-spacing: 2px;
-                    margin: 12px 0;
-                }}
-                /* 操作说明，采用灰色字体降低视觉干扰 */
-                .instructions {{
-                    color: #6b7280;
-                    font-size: 14px;
-                    margin: 16px 0;
-                }}
-                /* 安全提示，采用醒目的红色背景强调重要性 */
-                .security-note {{
-                    background: #fef2f2;
-                    color: #dc2626;
-                    padding: 12px;
-                    border-radius: 6px;
-                    font-size: 13px;
-                    margin-top: 24px;
-                }}
-                /* 页脚信息，采用小字号和浅色字体降低视觉权重 */
-                .footer {{
-                    color: #9ca3af;
-                    font-size: 12px;
-                    text-align: center;
-                    margin-top: 32px;
-                    padding-top: 16px;
-                    border-top: 1px solid #e5e7eb;
-                }}
-            </style>
-        </head>
-        <!-- 邮件正文，采用结构化布局提升可读性 -->
-        <body>
-            <div class="container">
-                <div class="header">
-                    <h2 style="margin:0;font-weight:600;">PEAK CLOUD SHARE</h2>
-                    <p style="margin:8px 0 0;font-size:18px;">账户激活验证</p>
-                </div>
-                
-                <div class="content">
-                    <p>尊敬的 {email}：</p>
-                    
-                    <p>感谢您注册 Peak Cloud Share，请使用以下验证码完成账户验证：</p>
-                    
-                    <div class="code-container">
-                        <div class="instructions">验证码（有效期5分钟）</div>
-                        <div class="verification-code">{code}</div>
-                    </div>
-
-                    <div class="security-note">
-                        ⚠️ 安全提示：请勿向任何人泄露此验证码，包括自称平台客服的人员
-                    </div>
-
-                    <div class="footer">
-                        <p>此邮件由系统自动发送，请勿直接回复</p>
-                        <p style="margin-top:8px;">&copy; {datetime.now().year}-{datetime.now().year + 1} Peak Cloud Share. All rights reserved.</p>
-                    </div>
-                </div>
-            </div>
-        </body>
-        </html>
-        """
+        now = datetime.now()
+        html_content = _EMAIL_TEMPLATE.format_map({
+            'email': email,
+            'code': code,
+            'year': now.year,
+            'next_year': now.year + 1
+        })
 
-        # 构建MIME邮件对象，指定HTML格式和UTF-8编码
-        msg = MIMEText(html_content, 'html', 'utf-8')
+        # 构建MIME邮件对象：纯文本与HTML两种格式，移动端可只显示简短的纯文本
+        msg = MIMEMultipart('alternative')
+        msg.attach(MIMEText(f"您的验证码：{code}（5分钟内有效）", 'plain', _UTF8_QP))
+        msg.attach(MIMEText(html_content, 'html', _UTF8_QP))
         msg['Subject'] = '【Peak Cloud Share】注册验证码'
         msg['From'] = f'Peak Cloud Mail Server 001 <{EMAIL_CONFIG["sender"]}>'  # 发件人格式优化
         msg['To'] = email
 
         # 手动构造中文日期字符串，避免依赖系统locale
-        now = datetime.now()
         msg['Date'] = f"{now.year}年{now.month}月{now.day}日 {now.hour}:{now.minute}"
 
         try:
             # 记录邮件发送日志，支持运营监控
             logger.info(f"尝试向 {email} 发送验证码邮件")
-            with smtplib.SMTP_SSL(
-                    EMAIL_CONFIG['smtp_server'],
-                    EMAIL_CONFIG['smtp_port'],
-                    timeout=10  # 合理设置超时时间
-            ) as server:
-                # 安全增强：密码强度校验（可扩展更复杂规则）
-                if len(EMAIL_CONFIG['password']) < 12:
-                    raise ValueError("邮件服务密码强度不足，至少需要12位字符")
-                # 建立安全连接并发送邮件
-                server.login(EMAIL_CONFIG['username'], EMAIL_CONFIG['password'])
-                logger.info(f"成功登录到 SMTP 服务器: {EMAIL_CONFIG['smtp_server']}")
-                server.sendmail(EMAIL_CONFIG['sender'], [email], msg.as_string())
+            # 复用连接池中已登录的安全连接发送邮件
+            EmailSender._send(email, msg.as_string())
             # 记录成功日志，支持运营分析
             logger.info(f"验证码邮件已成功发送至 {email}")
         except smtplib.SMTPConnectError as e:
@@ -12,12 +12,28 @@
 @copyright © 2025 D.C.Y. All rights reserved.
 """
 
+# 导入 heapq 模块，用于只取前几页时的部分排序
+import heapq
+# 导入 io 模块，用于识别不支持文件描述符的流
+import io
 # 导入日志模块，用于记录程序运行信息
 import logging
 # 导入操作系统相关功能模块
 import os
+# 导入正则表达式模块，用于文件名消毒
+import re
+# 导入系统模块，用于判断运行平台
+import sys
+# 导入临时文件模块，用于识别表单上传的临时文件
+import tempfile
+# 导入线程模块，用于保护文件列表缓存
+import threading
+# 导入时间模块，用于判断目录修改时间是否足够久远
+import time
 # 导入日期时间模块，用于处理日期和时间
 from datetime import datetime
+# 导入 itemgetter，用于按元组字段排序
+from operator import itemgetter
 # 导入 Path 类，用于处理文件路径
 from pathlib import Path
 # 导入 Dict 类型注解，用于类型提示
@@ -28,14 +44,33 @@ from flask import request, has_request_context
 # 从 werkzeug 库导入 FileStorage 类，用于处理文件上传
 from werkzeug.datastructures import FileStorage
 
+# numpy 为可选依赖，文件很多时用于按修改时间排序
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 # 从配置模块导入高危文件扩展名常量
-from config.constants import HIGH_RISK_EXTENSIONS
+from config.constants import HIGH_RISK_EXTENSIONS, UPLOAD_CHUNK_SIZE
 # 从路径管理模块导入 PathManager 类
 from core.path_manager import PathManager
 
 # 获取名为 __name__ 的日志记录器
 logger = logging.getLogger(__name__)
 
+# 文件名中需要移除的字符：除字母数字（\w 即 isalnum() 或下划线）、'-'、'.' 和路径分隔符以外的所有字符
+FILENAME_FORBIDDEN_PATTERN = re.compile(r'[^\w.\-/\\]+')
+# 目录修改时间距今不足该值（纳秒）时不缓存其内容：文件系统时间戳精度有限，紧随其后的修改可能不改变目录 mtime
+DIR_CACHE_MIN_AGE_NS = 2 * 10 ** 9
+# 文件数达到该值且已安装 numpy 时，改用 numpy 对修改时间数组做排序
+NUMPY_SORT_MIN_FILES = 10000
+# 大文件写入时每写入该字节数就建议内核丢弃已写入部分的页缓存，避免上传挤出数据库等热点页
+PAGE_CACHE_DROP_INTERVAL = 64 * 1024 * 1024
+# 只有 Linux 的 sendfile 支持普通文件作为输出端（macOS/BSD 要求输出端为套接字），其他平台逐块复制
+SENDFILE_TO_FILE = sys.platform.startswith('linux') and hasattr(os, 'sendfile')
+# 上传过程中临时文件名的后缀：写完后改名为正式文件名，扫描文件列表时跳过
+UPLOAD_TEMP_SUFFIX = '.uploading'
+
 
 class FileManager:
     """安全文件管理服务"""
@@ -56,6 +91,10 @@ class FileManager:
         self.allowed_extensions = allowed_extensions
         # 允许上传的文件最大大小
         self.max_size = max_size
+        # 文件列表缓存：目录路径 -> (目录 mtime, 文件元组列表, 子目录列表)，以及按修改时间排好序的完整列表
+        self._dir_cache = {}
+        self._sorted_files = None
+        self._scan_lock = threading.Lock()
         # 确保上传目录存在
         self._ensure_directories()
 
@@ -106,13 +145,10 @@ class FileManager:
         :param filename: 文件名
         :return: 如果是高危文件类型返回 True，否则返回 False
         """
-        # 如果文件名中不包含扩展名分隔符，则不是高危文件
-        if '.' not in filename:
-            return False
-        # 获取文件扩展名并转换为小写
-        ext = filename.rsplit('.', 1)[1].lower()
-        # 检查扩展名是否在高危文件扩展名列表中
-        return ext in HIGH_RISK_EXTENSIONS
+        # 获取最后一个点之后的扩展名并转换为小写（不含点时分隔符为空，不是高危文件）
+        _, sep, ext = filename.rpartition('.')
+        # 检查扩展名是否在高危文件扩展名集合中
+        return bool(sep) and ext.lower() in HIGH_RISK_EXTENSIONS
 
     def sanitize_filename(self, filename: str) -> str:
         """
@@ -121,8 +157,8 @@ class FileManager:
         :param filename: 原始文件名
         :return: 消毒后的文件名
         """
-        # 保留合法路径分隔符
-        cleaned = ''.join(c for c in filename if c.isalnum() or c in ('_', '-', '.', '/', '\\'))
+        # 保留合法路径分隔符（单次正则替换在C层完成，无需逐字符判断）
+        cleaned = FILENAME_FORBIDDEN_PATTERN.sub('', filename)
         # 标准化路径，统一使用正斜杠
         cleaned = cleaned.replace('\\', '/')
         # 防止目录遍历
@@ -141,19 +177,32 @@ class FileManager:
         :raises ValueError: 如果文件大小超过限制或文件名无效
         :raises RuntimeError: 如果文件保存失败
         """
+        return self.save_stream(file.stream, file.filename, username, file.content_length)
+
+    def save_stream(self, stream, original_name: str, username: str, content_length: int) -> str:
+        """
+        将输入流直接写入用户目录（表单上传与原始请求体上传共用）。
+
+        :param stream: 文件内容输入流
+        :param original_name: 原始文件名（可包含相对目录）
+        :param username: 上传文件的用户名
+        :param content_length: 声明的文件大小
+        :return: 文件保存后的相对路径
+        :raises ValueError: 如果文件大小超过限制或文件名无效
+        """
         # 检测文件大小
-        if file.content_length > self.max_size:
+        if content_length > self.max_size:
             # 若文件大小超过限制，抛出 ValueError 异常
             raise ValueError("单个文件大小超过10GB限制")
 
         # 检测文件类型
-        if self.is_high_risk(file.filename):
+        if self.is_high_risk(original_name):
             # 若为高危文件类型，抛出 ValueError 异常
             raise ValueError("检测到高危文件类型，禁止上传")
 
         # 检测文件扩展名
-        filename = self.sanitize_filename(file.filename)
-        if not filename:
+        filename = self.sanitize_filename(original_name)
+        if not filename or filename.endswith(UPLOAD_TEMP_SUFFIX):
             # 若文件名无效，抛出 ValueError 异常
             raise ValueError("无效的文件名")
 
@@ -161,20 +210,21 @@ class FileManager:
         date_str = datetime.now().strftime('%Y-%m-%d')
         base_dir = self.upload_folder / username / date_str
         full_path = base_dir / filename
-
-        # 创建目录结构
-        full_path.parent.mkdir(parents=True, exist_ok=True)
+        # 先写入同目录下的临时文件再改名：覆盖同名文件时改名同样会更新目录 mtime，
+        # 所有工作进程的目录列表缓存都能据此失效，写入中断时也不会破坏已有的同名文件
+        temp_path = full_path.with_name(f"{full_path.name}.{os.urandom(4).hex()}{UPLOAD_TEMP_SUFFIX}")
 
         try:
-            # 保存文件到指定路径
-            file.save(str(full_path))
+            # 保存文件到临时路径，完成后原子替换为正式文件
+            self._write_stream(stream, temp_path)
+            os.replace(temp_path, full_path)
             # 记录文件保存成功的日志信息
             logger.info(
                 "文件保存成功: %s",
                 str(f"{username}/{date_str}/{filename}"),
                 extra={
                     'method': 'POST',
-                    'path': '/',
+                    'path': request.path if has_request_context() else '/',
                     'status_code': 200,
                     'client_ip': request.remote_addr if has_request_context() else '-',
                     'request_id': request.id if has_request_context() else '-',
@@ -183,12 +233,14 @@ class FileManager:
             )
             return filename
         except Exception as e:
+            # 写入中断（如客户端断开）时删除不完整的临时文件
+            temp_path.unlink(missing_ok=True)
             # 记录文件保存失败的日志信息
             logger.error(
                 "文件保存失败: %s", str(e),
                 extra={
                     'method': 'POST',
-                    'path': '/',
+                    'path': request.path if has_request_context() else '/',
                     'status_code': 500,
                     'client_ip': request.remote_addr if has_request_context() else '-',
                     'request_id': request.id if has_request_context() else '-',
@@ -198,6 +250,138 @@ class FileManager:
             # 重新抛出异常
             raise
 
+    @staticmethod
+    def _backing_fileno(stream):
+        """
+        返回上传流背后磁盘文件的描述符。
+
+        表单上传的大文件由 Werkzeug 暂存在 SpooledTemporaryFile 中；
+        仍在内存中的暂存文件、请求体等非文件流返回 None（调用 fileno() 会迫使暂存文件落盘）。
+
+        :param stream: 上传文件的输入流
+        :return: 文件描述符或 None
+        """
+        if isinstance(stream, tempfile.SpooledTemporaryFile) and not stream._rolled:
+            return None
+        try:
+            return stream.fileno()
+        except (AttributeError, OSError, io.UnsupportedOperation):
+            return None
+
+    @staticmethod
+    def _open_target(target: Path):
+        """
+        以无缓冲写模式打开目标文件，目录不存在时才创建目录结构。
+
+        批量上传到同一目录时，除第一个文件外不再产生 mkdir/stat 系统调用。
+
+        :param target: 目标文件路径
+        :return: 打开的文件对象
+        """
+        try:
+            return open(target, 'wb', buffering=0)
+        except FileNotFoundError:
+            target.parent.mkdir(parents=True, exist_ok=True)
+            return open(target, 'wb', buffering=0)
+
+    @staticmethod
+    def _write_stream(stream, target: Path):
+        """
+        将上传流分块写入目标文件。
+
+        源为磁盘临时文件时由内核 sendfile 直接复制（仅 Linux），数据不经过用户态；
+        其余流复用同一块预分配缓冲区（readinto），避免逐块创建 bytes 对象；
+        目标文件以无缓冲方式打开，每块只产生一次 write 系统调用。
+        大文件在写入过程中及写入完成后建议内核丢弃其页缓存（近期不会再读取）。
+
+        :param stream: 上传文件的输入流
+        :param target: 目标文件路径
+        """
+        src_fd = FileManager._backing_fileno(stream) if SENDFILE_TO_FILE else None
+        with FileManager._open_target(target) as dst:
+            if src_fd is not None:
+                offset = stream.tell()
+                end = os.fstat(src_fd).st_size
+                while offset < end:
+                    sent = os.sendfile(dst.fileno(), src_fd, offset, end - offset)
+                    if not sent:
+                        break
+                    offset += sent
+            elif (readinto := getattr(stream, 'readinto', None)) is None:
+                # 不支持 readinto 的流退回普通分块读取
+                while chunk := stream.read(UPLOAD_CHUNK_SIZE):
+                    dst.write(chunk)
+            else:
+                buffer = bytearray(UPLOAD_CHUNK_SIZE)
+                view = memoryview(buffer)
+                written = 0
+                next_drop = PAGE_CACHE_DROP_INTERVAL
+                while n := readinto(buffer):
+                    dst.write(view[:n])
+                    written += n
+                    if written >= next_drop:
+                        # 已回写的页被丢弃，仍为脏页的部分由此开始异步回写，下次再丢弃
+                        FileManager._drop_page_cache(dst.fileno())
+                        next_drop = written + PAGE_CACHE_DROP_INTERVAL
+
+            if dst.tell() >= PAGE_CACHE_DROP_INTERVAL:
+                FileManager._drop_page_cache(dst.fileno())
+
+    @staticmethod
+    def _drop_page_cache(fd: int):
+        """
+        建议内核丢弃文件的页缓存（仅支持 posix_fadvise 的平台，如 Linux）。
+
+        :param fd: 文件描述符
+        """
+        if hasattr(os, 'posix_fadvise'):
+            try:
+                os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+            except OSError:
+                pass
+
+    def _scan_files(self):
+        """
+        使用 os.scandir 遍历上传目录，按目录缓存扫描结果。
+
+        目录项类型直接取自 getdents 返回的 d_type，每个文件只需一次 stat，
+        且不为每个条目创建 Path 对象；目录 mtime 未变化时直接复用上次的文件与子目录列表，
+        未变化的目录只需一次 stat。
+
+        :return: ((相对路径, 大小, 创建时间, 修改时间) 元组列表, 是否与上次扫描结果完全相同)
+        """
+        now_ns = time.time_ns()
+        cache = {}
+        files = []
+        unchanged = True
+        stack = [(str(self.upload_folder), '')]
+        while stack:
+            directory, prefix = stack.pop()
+            mtime_ns = os.stat(directory).st_mtime_ns
+            cached = self._dir_cache.get(directory)
+            if cached is not None and cached[0] == mtime_ns:
+                _, dir_files, subdirs = cached
+            else:
+                unchanged = False
+                dir_files, subdirs = [], []
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        name = prefix + entry.name
+                        if entry.is_dir(follow_symlinks=False):
+                            subdirs.append((entry.path, name + os.sep))
+                        elif entry.is_file() and not entry.name.endswith(UPLOAD_TEMP_SUFFIX):
+                            stat = entry.stat()
+                            dir_files.append((name, stat.st_size, stat.st_ctime, stat.st_mtime))
+            if now_ns - mtime_ns >= DIR_CACHE_MIN_AGE_NS:
+                cache[directory] = (mtime_ns, dir_files, subdirs)
+            files.extend(dir_files)
+            stack.extend(subdirs)
+        # 只保留本次仍存在的目录，已删除目录的条目随之清除
+        if len(cache) != len(self._dir_cache):
+            unchanged = False
+        self._dir_cache = cache
+        return files, unchanged
+
     def list_files(self, page: int = 1, per_page: int = 20) -> Dict:
         """
         分页获取文件列表。
@@ -206,39 +390,49 @@ class FileManager:
         :param per_page: 每页显示的文件数量，默认为 20
         :return: 包含文件列表、当前页码、总页数和文件总数的字典
         """
-        # 存储文件信息的列表
-        files = []
         try:
-            # 递归遍历所有子目录
-            for entry in self.upload_folder.glob('**/*'):
-                if entry.is_file():
-                    # 获取文件的相对路径
-                    relative_path = entry.relative_to(self.upload_folder)
-                    # 获取文件的统计信息
-                    stat = entry.stat()
-                    # 将文件信息添加到列表中
-                    files.append({
-                        'name': str(relative_path),
-                        'size': stat.st_size,
-                        'upload_time': stat.st_ctime,
-                        'modified_time': stat.st_mtime
-                    })
-
-            # 按修改时间降序排序
-            files.sort(key=lambda x: x['modified_time'], reverse=True)
-            # 计算文件总数
-            total = len(files)
-            # 计算总页数
-            total_pages = max(1, (total + per_page - 1) // per_page)
-            # 确保页码在有效范围内
-            page = max(1, min(page, total_pages))
-            # 计算当前页的起始索引
-            start = (page - 1) * per_page
-            # 计算当前页的结束索引
-            end = start + per_page
+            # 递归遍历所有子目录（目录未变化时复用缓存）
+            with self._scan_lock:
+                files, unchanged = self._scan_files()
+                if not unchanged:
+                    self._sorted_files = None
+
+                # 计算文件总数
+                total = len(files)
+                # 计算总页数
+                total_pages = max(1, (total + per_page - 1) // per_page)
+                # 确保页码在有效范围内
+                page = max(1, min(page, total_pages))
+                # 计算当前页的起始索引
+                start = (page - 1) * per_page
+                # 计算当前页的结束索引
+                end = start + per_page
+
+                # 按修改时间降序排序：文件未变化时直接切片缓存的完整排序结果；
+                # 文件很多时只把修改时间放入 float64 数组做稳定排序，再按下标重排元组；
+                # 完整排序结果在锁内写入缓存，避免覆盖其他线程重新扫描后的失效标记
+                if self._sorted_files is None:
+                    if np is not None and total >= NUMPY_SORT_MIN_FILES:
+                        mtimes = np.fromiter(map(itemgetter(3), files), dtype=np.float64, count=total)
+                        order = np.argsort(-mtimes, kind='stable')
+                        self._sorted_files = [files[i] for i in order.tolist()]
+                    elif end > total // 8:
+                        files.sort(key=itemgetter(3), reverse=True)
+                        self._sorted_files = files
+                sorted_files = self._sorted_files
+
+            # 未缓存完整排序时，靠前的页只需前 end 个文件，用堆做部分排序（结果与完整排序一致）
+            if sorted_files is not None:
+                files = sorted_files
+            else:
+                files = heapq.nlargest(end, files, key=itemgetter(3))
 
             return {
-                'items': files[start:end],
+                # 只为当前页的文件构建字典
+                'items': [
+                    {'name': name, 'size': size, 'upload_time': upload_time, 'modified_time': modified_time}
+                    for name, size, upload_time, modified_time in files[start:end]
+                ],
                 'page': page,
                 'total_pages': total_pages,
                 'total': total
@@ -12,17 +12,164 @@
 @copyright © 2025 D.C.Y. All rights reserved.
 """
 
+import heapq
+import mmap
+import multiprocessing
+import os
+import json
 import re
-import sys
-from collections import defaultdict
+import threading
+import time
+from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
+from functools import lru_cache
+from itertools import chain
+from operator import attrgetter, itemgetter, methodcaller
 from pathlib import Path
 
-import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
-import plotly.io as pio
-from plotly.subplots import make_subplots
+from jinja2 import Environment, FileSystemLoader
+
+try:
+    import gevent  # gunicorn gevent工作模式下报告生成交给hub的原生线程池执行
+    from gevent import monkey
+except ImportError:
+    gevent = monkey = None
+
+from core.path_manager import PathManager
+
+# 逐行解析使用的正则（模块加载时编译一次，错误日志与应用日志格式相同）
+# 请求 ID、User-Agent、模块名等统计中用不到的字段只匹配不捕获
+ACCESS_LOG_PATTERN = re.compile(r'\[(.*?)\] \[(.*?)\] \[.*?\] "(.*?)" (\d+) (.*?)ms ".*?"')
+APPLICATION_LOG_PATTERN = re.compile(r'\[(.*?)\] \[(\w+)\s*\] \[\w+\s*\] \[.*?\] \[.*?\] (.*?) \[(.*?)\]')
+# 从日志上下文和消息中提取用户、接口路径和上传文件名的正则
+USER_CONTEXT_PATTERN = re.compile(r'user=([^\s]+)')
+PATH_CONTEXT_PATTERN = re.compile(r'path=([^\s]+)')
+USER_MESSAGE_PATTERN = re.compile(r'用户 (.*?) ')
+UPLOAD_FAILED_PATTERN = re.compile(r'上传文件 (.*?) 失败')
+
+# 整文件批量解析使用的正则（每个日志文件的类型已由文件名确定，只需用对应的一个正则扫描，无需多模式逐行分类）：
+# 首行用 ^ 锚定的多行正则匹配；其余行的正则以换行符开头，正则引擎可按字面前缀 '\n[' 快速跳过
+# 堆栈、横幅等不以 '[' 开头的行，不必在每个字符位置尝试 ^ 锚点。各字段均不跨行，两者匹配结果一致
+_ACCESS_LOG_RECORD = r'\[(.*?)\] \[(.*?)\] \[.*?\] "(.*?)" (\d+) (.*?)ms ".*?"'
+_APPLICATION_LOG_RECORD = r'\[(.*?)\] \[(\w+)[ \t]*\] \[\w+[ \t]*\] \[.*?\] \[.*?\] (.*?) \[(.*?)\]'
+ACCESS_LOG_LINE_PATTERN = re.compile('^' + _ACCESS_LOG_RECORD, re.MULTILINE)
+APPLICATION_LOG_LINE_PATTERN = re.compile('^' + _APPLICATION_LOG_RECORD, re.MULTILINE)
+ACCESS_LOG_NEXT_LINE_PATTERN = re.compile(r'\n' + _ACCESS_LOG_RECORD)
+APPLICATION_LOG_NEXT_LINE_PATTERN = re.compile(r'\n' + _APPLICATION_LOG_RECORD)
+
+# 待解析数据总量超过该值（字节）时才启用多进程解析，小文件直接在当前进程解析更快
+PARALLEL_PARSE_THRESHOLD = 8 * 1024 * 1024
+# 并行解析时每个分片的最小字节数，分片边界对齐到换行符
+PARALLEL_SHARD_SIZE = 4 * 1024 * 1024
+# 解析进程以 spawn 方式启动：从带有日志监听、调度等后台线程的进程 fork 可能继承被占用的锁而死锁
+PARALLEL_PARSE_CONTEXT = multiprocessing.get_context('spawn')
+
+# 分析报告的 Jinja2 模板文件名（位于 Web 目录）
+REPORT_TEMPLATE = 'report_template.html'
+
+# 各类日志按列存储的字段（错误日志与应用日志字段相同），只保留统计和报告实际读取的字段
+ACCESS_LOG_FIELDS = ('timestamp', 'ip', 'method', 'path', 'status_code', 'response_time')
+APPLICATION_LOG_FIELDS = ('timestamp', 'log_level', 'message', 'context')
+
+
+@lru_cache(maxsize=4096)
+def _parse_timestamp(value):
+    """
+    解析 '%Y-%m-%d %H:%M:%S' 格式的日志时间戳。
+
+    格式固定时直接按位置切片转换整数，比 datetime.strptime 快得多；
+    同一秒内的多条日志时间戳相同，结果按字符串缓存。其他格式仍交给 strptime 处理。
+    """
+    if len(value) == 19 and value[4] == value[7] == '-' and value[10] == ' ' and value[13] == value[16] == ':':
+        return datetime(int(value[0:4]), int(value[5:7]), int(value[8:10]),
+                        int(value[11:13]), int(value[14:16]), int(value[17:19]))
+    return datetime.strptime(value, '%Y-%m-%d %H:%M:%S')
+
+
+def _plotly_bundle_src():
+    """
+    返回图表页面引用的 plotly.js 脚本地址（相对 Web 目录，由静态资源路由提供）。
+
+    plotly.js 约 4.8MB，内嵌到每次生成的图表页面中会拖慢写入和加载；
+    改为按版本号命名写入静态资源目录一次，之后生成的页面只引用该文件，浏览器也可长期缓存。
+    """
+    from plotly.offline import get_plotlyjs, get_plotlyjs_version
+
+    name = f"plotly-{get_plotlyjs_version()}.min.js"
+    bundle = PathManager.get_assets_folder() / 'js' / name
+    if not bundle.exists():
+        bundle.parent.mkdir(parents=True, exist_ok=True)
+        # 先写临时文件再原子替换，多进程同时生成时不会读到不完整的脚本
+        tmp_path = bundle.with_name(f".{name}.{os.getpid()}.tmp")
+        tmp_path.write_text(get_plotlyjs(), encoding='utf-8')
+        os.replace(tmp_path, bundle)
+    return f"assets/js/{name}"
+
+
+@lru_cache(maxsize=None)
+def _report_template():
+    """
+    加载并编译分析报告模板，进程内只编译一次。
+
+    开启自动转义，文件名、用户、路径等来自日志的字段在渲染时统一做 HTML 转义。
+    """
+    env = Environment(loader=FileSystemLoader(str(PathManager.get_web_folder())), autoescape=True)
+    return env.get_template(REPORT_TEMPLATE)
+
+
+@lru_cache(maxsize=None)
+def _figure_skeleton():
+    """
+    构建综合分析图表的骨架：3x3 子图网格及整体布局（尺寸、标题、plotly_dark 主题和配色），不含数据。
+
+    骨架与日志数据无关，进程内只构建一次；生成图表时复制骨架再加入各子图数据，
+    不必每次重新执行 make_subplots 和 update_layout 的布局校验与主题解析。
+    """
+    from plotly.subplots import make_subplots
+
+    # 创建子图网格
+    fig = make_subplots(
+        rows=3, cols=3,
+        subplot_titles=(
+            "每小时请求量热力图", "状态码分布", "请求方法分布",
+            "日志级别分布", "TOP 10活跃用户", "协议类型分布",
+            "安全事件统计", "文件类型分布", "下载统计"
+        ),
+        specs=[
+            [{'type': 'heatmap'}, {'type': 'pie'}, {'type': 'bar'}],
+            [{'type': 'bar'}, {'type': 'bar'}, {'type': 'pie'}],
+            [{'type': 'bar'}, {'type': 'pie'}, {'type': 'bar'}]
+        ]
+    )
+
+    # 更新布局
+    fig.update_layout(
+        height=1200,
+        width=1200,
+        title_text="综合日志分析可视化",
+        template="plotly_dark",
+        plot_bgcolor="#111827",
+        paper_bgcolor="#111827",
+        font=dict(color="white", family="Arial, sans-serif"),
+        margin=dict(l=40, r=40, t=80, b=40),
+        showlegend=False
+    )
+    return fig
+
+
+def _gevent_patched():
+    """当前进程是否运行在 gevent 协程模式下（threading 已被 monkey patch）"""
+    return monkey is not None and monkey.is_module_patched('threading')
+
+
+def _parse_file_worker(log_type, file_path, offset, end):
+    """子进程解析日志文件的一个分片，返回可合并到主分析器的部分结果"""
+    analyzer = AdvancedLogAnalyzer()
+    end = analyzer.parse_file(log_type, file_path, offset, end)
+    result = analyzer.analysis_result
+    return (end, analyzer.log_data[log_type], dict(result['users']),
+            result['response_times'], dict(result['interface_response_times']))
 
 
 class AdvancedLogAnalyzer:
@@ -36,27 +183,28 @@ class AdvancedLogAnalyzer:
         初始化日志分析器，创建日志数据存储和分析结果存储的容器。
         此初始化方法为后续的日志解析和分析工作做好准备，确保数据有统一的存储结构。
         """
-        # 初始化日志数据存储，按日志类型分类存储解析后的日志条目
+        # 初始化日志数据存储：按日志类型分类，每种类型按列存储（字段名 -> 该字段所有记录的值列表），
+        # 避免为每条记录创建字典，统计时整列读取
         self.log_data = {
-            'access': [],
-            'application': [],
-            'error': []
+            'access': {field: [] for field in ACCESS_LOG_FIELDS},
+            'application': {field: [] for field in APPLICATION_LOG_FIELDS},
+            'error': {field: [] for field in APPLICATION_LOG_FIELDS}
         }
 
         # 初始化分析结果存储，存储各种统计分析结果
         self.analysis_result = {
-            'time_distribution': defaultdict(int),
-            'request_types': defaultdict(int),
-            'status_codes': defaultdict(int),
-            'ip_activities': defaultdict(int),
-            'log_levels': defaultdict(int),
-            'handlers': defaultdict(int),
+            'time_distribution': Counter(),
+            'request_types': Counter(),
+            'status_codes': Counter(),
+            'ip_activities': Counter(),
+            'log_levels': Counter(),
+            'handlers': Counter(),
             'user_actions': defaultdict(lambda: defaultdict(int)),
-            'protocols': defaultdict(int),
+            'protocols': Counter(),
             'security_events': [],
-            'file_types': defaultdict(int),
+            'file_types': Counter(),
             'users': defaultdict(int),
-            'download_stats': defaultdict(int),
+            'download_stats': Counter(),
             'response_times': [],
             'interface_response_times': defaultdict(list)
         }
@@ -69,32 +217,29 @@ class AdvancedLogAnalyzer:
         参数:
             line (str): 单行访问日志内容。
         """
-        # 定义访问日志的正则表达式模式
-        pattern = r'\[(.*?)\] \[(.*?)\] \[(.*?)\] "(.*?)" (\d+) (.*?)ms "(.*?)"'
-        # 尝试匹配日志行
-        match = re.match(pattern, line)  # 传统赋值语句
+        # 不以 '[' 开头的行不可能匹配，直接跳过正则
+        if not line.startswith('['):
+            return
+        # 尝试匹配日志行（使用预编译的访问日志正则）
+        match = ACCESS_LOG_PATTERN.match(line)  # 传统赋值语句
         if match:  # 传统条件判断
-            # 提取匹配到的信息并构建日志条目
-            entry = {
-                'timestamp': datetime.strptime(match.group(1), '%Y-%m-%d %H:%M:%S'),
-                'ip': match.group(2),
-                'request_id': match.group(3),
-                'method': match.group(4).split()[0],
-                'path': match.group(4).split()[1] if len(match.group(4).split()) > 1 else '',
-                'status_code': int(match.group(5)),
-                'response_time': float(match.group(6)),
-                'user_agent': match.group(7),
-                'protocol': 'HTTP/1.1',
-                'log_type': 'access'
-            }
-            # 将日志条目添加到访问日志数据中
-            self.log_data['access'].append(entry)
-            # 将响应时间添加到分析结果的响应时间列表中
-            self.analysis_result['response_times'].append(entry['response_time'])
+            self._add_columns('access', self._access_columns([match.groups()]))
 
-            # 按接口路径统计响应时间
-            path = entry['path'].split('?')[0] if '?' in entry['path'] else entry['path']
-            self.analysis_result['interface_response_times'][path].append(entry['response_time'])
+    @staticmethod
+    def _access_columns(records):
+        """
+        将访问日志的匹配分组（元组）列表按列转换为各字段的值列表，字段与 ACCESS_LOG_FIELDS 一致。
+        逐列用 map/itemgetter 在 C 层取值和转换类型，不为每条记录构建中间对象。
+        """
+        request_parts = [request.split() for request in map(itemgetter(2), records)]
+        return {
+            'timestamp': list(map(_parse_timestamp, map(itemgetter(0), records))),
+            'ip': list(map(itemgetter(1), records)),
+            'method': [parts[0] for parts in request_parts],
+            'path': [parts[1] if len(parts) > 1 else '' for parts in request_parts],
+            'status_code': list(map(int, map(itemgetter(3), records))),
+            'response_time': list(map(float, map(itemgetter(4), records)))
+        }
 
     def parse_application_log(self, line):
         """
@@ -104,31 +249,23 @@ class AdvancedLogAnalyzer:
         参数:
             line (str): 单行应用日志内容。
         """
-        # 定义应用日志的正则表达式模式
-        pattern = r'\[(.*?)\] \[(\w+)\s*\] \[(\w+)\s*\] \[(.*?)\] \[(.*?)\] (.*?) \[(.*?)\]'
-        # 尝试匹配日志行
-        match = re.match(pattern, line)  # 传统赋值语句
+        # 不以 '[' 开头的行不可能匹配，直接跳过正则
+        if not line.startswith('['):
+            return
+        # 尝试匹配日志行（使用预编译的应用日志正则）
+        match = APPLICATION_LOG_PATTERN.match(line)  # 传统赋值语句
         if match:  # 传统条件判断
-            # 提取匹配到的信息并构建日志条目
-            entry = {
-                'timestamp': datetime.strptime(match.group(1), '%Y-%m-%d %H:%M:%S'),
-                'log_level': match.group(2).strip(),
-                'module': match.group(3).strip(),
-                'ip': match.group(4),
-                'request_id': match.group(5),
-                'message': match.group(6),
-                'context': match.group(7),
-                'log_type': 'application'
-            }
-            # 将日志条目添加到应用日志数据中
-            self.log_data['application'].append(entry)
-
-            # 提取用户信息
-            if '用户' in match.group(6):
-                user = re.search(r'用户 (.*?) ', match.group(6))
-                if user:
-                    # 统计用户请求次数
-                    self.analysis_result['users'][user.group(1)] += 1
+            self._add_columns('application', self._application_columns([match.groups()]))
+
+    @staticmethod
+    def _application_columns(records):
+        """将应用/错误日志的匹配分组（元组）列表按列转换为各字段的值列表，字段与 APPLICATION_LOG_FIELDS 一致"""
+        return {
+            'timestamp': list(map(_parse_timestamp, map(itemgetter(0), records))),
+            'log_level': list(map(str.strip, map(itemgetter(1), records))),
+            'message': list(map(itemgetter(2), records)),
+            'context': list(map(itemgetter(3), records))
+        }
 
     def parse_error_log(self, line):
         """
@@ -138,82 +275,215 @@ class AdvancedLogAnalyzer:
         参数:
             line (str): 单行错误日志内容。
         """
-        # 定义错误日志的正则表达式模式
-        pattern = r'\[(.*?)\] \[(\w+)\s*\] \[(\w+)\s*\] \[(.*?)\] \[(.*?)\] (.*?) \[(.*?)\]'
-        # 尝试匹配日志行
-        match = re.match(pattern, line)  # 传统赋值语句
+        # 不以 '[' 开头的行不可能匹配，直接跳过正则
+        if not line.startswith('['):
+            return
+        # 尝试匹配日志行（错误日志与应用日志格式相同）
+        match = APPLICATION_LOG_PATTERN.match(line)  # 传统赋值语句
         if match:  # 传统条件判断
-            # 提取匹配到的信息并构建日志条目
-            entry = {
-                'timestamp': datetime.strptime(match.group(1), '%Y-%m-%d %H:%M:%S'),
-                'log_level': match.group(2).strip(),
-                'module': match.group(3).strip(),
-                'ip': match.group(4),
-                'request_id': match.group(5),
-                'message': match.group(6),
-                'context': match.group(7),
-                'log_type': 'error'
-            }
-            # 将日志条目添加到错误日志数据中
-            self.log_data['error'].append(entry)
+            self._add_columns('error', self._application_columns([match.groups()]))
+
+    def _add_columns(self, log_type, new_columns):
+        """
+        将一批按列组织的记录追加到日志数据中，并更新解析阶段的统计：
+        访问日志记录响应时间及按接口路径的响应时间，应用日志统计用户请求次数。
+        """
+        columns = self.log_data[log_type]
+        for field, values in new_columns.items():
+            columns[field].extend(values)
+
+        if log_type == 'access':
+            # 将响应时间添加到分析结果的响应时间列表中
+            response_times = new_columns['response_time']
+            self.analysis_result['response_times'].extend(response_times)
+            # 按接口路径统计响应时间
+            interface_response_times = self.analysis_result['interface_response_times']
+            for path, response_time in zip(new_columns['path'], response_times):
+                interface_response_times[path.partition('?')[0]].append(response_time)
+        elif log_type == 'application':
+            # 提取用户信息，统计用户请求次数
+            users = self.analysis_result['users']
+            for message in new_columns['message']:
+                if '用户' in message:
+                    user = USER_MESSAGE_PATTERN.search(message)
+                    if user:
+                        users[user.group(1)] += 1
+
+    def parse_file(self, log_type, file_path, offset=0, end=None):
+        """
+        整文件批量解析日志，替代逐行调用 parse_*_log。
+        文件通过 mmap 映射后直接从映射内存一次解码，再用正则的 findall 在 C 层一次提取出所有记录的分组元组，
+        不再为每一行执行 Python 级的读取、strip 和 re.match 调用，也不为每条记录创建 Match 对象。
+
+        参数:
+            log_type (str): 日志类型，可选 'access'、'application'、'error'。
+            file_path (str | Path): 日志文件路径。
+            offset (int): 起始字节偏移，用于只解析上次之后追加的内容。
+            end (int | None): 结束字节偏移（须位于行首），为 None 时解析到最后一个完整行。
+
+        返回:
+            int: 已解析到的字节偏移（只解析以换行结尾的完整行）。
+        """
+        if log_type == 'access':
+            pattern, next_line_pattern = ACCESS_LOG_LINE_PATTERN, ACCESS_LOG_NEXT_LINE_PATTERN
+        elif log_type in ('application', 'error'):
+            pattern, next_line_pattern = APPLICATION_LOG_LINE_PATTERN, APPLICATION_LOG_NEXT_LINE_PATTERN
+        else:
+            raise ValueError(f"未知的日志类型: {log_type}")
+
+        with open(file_path, 'rb') as f:
+            # 没有新内容（空文件也无法映射）
+            if os.fstat(f.fileno()).st_size <= offset:
+                return offset
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                if end is None:
+                    end = mm.rfind(b'\n', offset) + 1
+                    if end <= offset:
+                        return offset
+                # 顺序读取提示内核加大预读；直接从映射内存解码，不先复制出中间 bytes 对象
+                if hasattr(mmap, 'MADV_SEQUENTIAL'):
+                    mm.madvise(mmap.MADV_SEQUENTIAL, offset - offset % mmap.PAGESIZE)
+                with memoryview(mm) as view, view[offset:end] as chunk:
+                    text = str(chunk, 'utf-8', 'replace')
+
+        records = next_line_pattern.findall(text)
+        first = pattern.match(text)
+        if first:
+            records.insert(0, first.groups())
+        if log_type == 'access':
+            self._add_columns(log_type, self._access_columns(records))
+        else:
+            self._add_columns(log_type, self._application_columns(records))
+        return end
+
+    @staticmethod
+    def _split_ranges(file_path, offset, shards):
+        """
+        将日志文件从 offset 到最后一个完整行的内容切分为至多 shards 个字节区间，区间边界对齐到换行符。
+
+        返回:
+            list: (起始偏移, 结束偏移) 列表，没有新的完整行时为空列表。
+        """
+        with open(file_path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size <= offset:
+                return []
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                end = mm.rfind(b'\n', offset) + 1
+                step = max(PARALLEL_SHARD_SIZE, -(-(end - offset) // shards))
+                ranges = []
+                start = offset
+                while start < end:
+                    stop = min(start + step, end)
+                    if stop < end:
+                        # 延伸到分片内最后一行的行尾
+                        stop = mm.find(b'\n', stop - 1) + 1
+                    ranges.append((start, stop))
+                    start = stop
+                return ranges
+
+    def parse_files(self, jobs):
+        """
+        解析多个日志文件；待解析数据量较大时将各文件按换行对齐切分为字节分片，
+        交给多个进程并行解析（绕过GIL），再按分片顺序将各进程的部分结果合并到当前分析器，
+        合并后的条目顺序与单进程解析一致。gevent 协程模式下不创建进程池，始终在当前进程解析。
+
+        参数:
+            jobs (dict): 日志类型到 (文件路径, 起始偏移) 的映射。
+
+        返回:
+            dict: 日志类型到已解析字节偏移的映射。
+        """
+        workers = os.cpu_count() or 1
+        pending = sum(max(os.path.getsize(path) - offset, 0) for path, offset in jobs.values())
+        if workers < 2 or pending < PARALLEL_PARSE_THRESHOLD or _gevent_patched():
+            return {log_type: self.parse_file(log_type, path, offset) for log_type, (path, offset) in jobs.items()}
+
+        offsets = {log_type: offset for log_type, (path, offset) in jobs.items()}
+        shards = [
+            (log_type, str(path), start, stop)
+            for log_type, (path, offset) in jobs.items()
+            for start, stop in self._split_ranges(path, offset, workers)
+        ]
+        if not shards:
+            return offsets
+        with ProcessPoolExecutor(max_workers=min(workers, len(shards)), mp_context=PARALLEL_PARSE_CONTEXT) as executor:
+            futures = [(shard[0], executor.submit(_parse_file_worker, *shard)) for shard in shards]
+            for log_type, future in futures:
+                end, entries, users, response_times, interface_response_times = future.result()
+                offsets[log_type] = end
+                for field, values in entries.items():
+                    self.log_data[log_type][field].extend(values)
+                for user, count in users.items():
+                    self.analysis_result['users'][user] += count
+                self.analysis_result['response_times'].extend(response_times)
+                for path, times in interface_response_times.items():
+                    self.analysis_result['interface_response_times'][path].extend(times)
+        return offsets
 
     def analyze_logs(self):
         """
         分析日志数据，对解析后的日志条目进行统计和汇总。
         该方法对不同类型的日志进行综合分析，生成各种统计结果，为后续的可视化和报告生成提供数据支持。
         """
-        for log_type in ['access', 'application', 'error']:
-            for entry in self.log_data[log_type]:
-                hour = entry['timestamp'].hour
-                self.analysis_result['time_distribution'][hour] += 1
-
-                if log_type == 'access':
-                    self.analysis_result['request_types'][entry['method']] += 1
-                    self.analysis_result['status_codes'][entry['status_code']] += 1
-                    self.analysis_result['ip_activities'][entry['ip']] += 1
-                    self.analysis_result['protocols'][entry['protocol']] += 1
-
-                    # 提取用户信息
-                    if 'user=' in entry.get('context', ''):
-                        user_match = re.search(r'user=([^\s]+)', entry['context'])
-                        if user_match:
-                            user = user_match.group(1)
-                            self.analysis_result['user_actions'][user]['requests'] += 1
-
-                    # 提取下载信息
-                    if 'download' in entry['path']:
-                        filename = entry['path'].split('/')[-1]
-                        file_ext = filename.split('.')[-1] if '.' in filename else 'unknown'
-                        self.analysis_result['file_types'][file_ext] += 1
-                        self.analysis_result['download_stats'][filename] += 1
-
-                self.analysis_result['log_levels'][entry.get('log_level', '')] += 1
-
-                # 提取接口路径
-                if 'path=' in entry.get('context', ''):
-                    path_match = re.search(r'path=([^\s]+)', entry['context'])
-                    if path_match:
-                        path = path_match.group(1)
-                        self.analysis_result['handlers'][path] += 1
-
-                # 提取安全事件
-                if entry.get('log_level') == 'ERROR' and '高危文件类型' in entry.get('message', ''):
-                    message = entry.get('message')
-                    if message:
-                        filename_match = re.search(r'上传文件 (.*?) 失败', message)
-                        if filename_match:
-                            filename = filename_match.group(1)
-                            file_ext = filename.split('.')[-1] if '.' in filename else 'unknown'
-                            user_match = re.search(r'用户 (.*?) ', message)
-                            if user_match:
-                                user = user_match.group(1)
-                                self.analysis_result['security_events'].append({
-                                    'timestamp': entry['timestamp'],
-                                    'user': user,
-                                    'filename': filename,
-                                    'type': '高危文件拦截',
-                                    'extension': file_ext
-                                })
+        # 重置由本方法统计的结果，保证增量解析后重复调用时不会重复计数
+        for key in ('time_distribution', 'request_types', 'status_codes', 'ip_activities',
+                    'protocols', 'file_types', 'download_stats', 'log_levels', 'handlers'):
+            self.analysis_result[key].clear()
+        self.analysis_result['user_actions'].clear()
+        self.analysis_result['security_events'].clear()
+
+        # 计数类统计直接读取整列字段，交给 Counter.update（C 实现）一次计数，避免逐条 += 1
+        access = self.log_data['access']
+        self.analysis_result['request_types'].update(access['method'])
+        self.analysis_result['status_codes'].update(access['status_code'])
+        self.analysis_result['ip_activities'].update(access['ip'])
+        # 访问日志只记录 HTTP/1.1 请求，协议分布按访问日志条数计数，不再逐条保存协议字段
+        if access['timestamp']:
+            self.analysis_result['protocols']['HTTP/1.1'] = len(access['timestamp'])
+
+        # 提取下载信息：用 partition/rpartition 只在分隔符处切一次，不像 split 那样为每条路径构建整个列表
+        downloads = [path.rpartition('/')[2] for path in access['path'] if 'download' in path]
+        self.analysis_result['file_types'].update(
+            [ext if dot else 'unknown' for _, dot, ext in map(methodcaller('rpartition', '.'), downloads)])
+        self.analysis_result['download_stats'].update(downloads)
+
+        # 三类日志串联为一次遍历：按小时统计请求量，并统计日志级别（访问日志没有日志级别，按空级别计数）
+        application, error = self.log_data['application'], self.log_data['error']
+        self.analysis_result['time_distribution'].update(map(attrgetter('hour'), chain(
+            access['timestamp'], application['timestamp'], error['timestamp'])))
+        if access['timestamp']:
+            self.analysis_result['log_levels'][''] += len(access['timestamp'])
+        self.analysis_result['log_levels'].update(chain(application['log_level'], error['log_level']))
+
+        # 应用日志与错误日志合并为一次遍历，提取接口路径与安全事件
+        for timestamp, log_level, message, context in chain.from_iterable(
+                zip(columns['timestamp'], columns['log_level'], columns['message'], columns['context'])
+                for columns in (application, error)):
+            # 提取接口路径
+            if 'path=' in context:
+                path_match = PATH_CONTEXT_PATTERN.search(context)
+                if path_match:
+                    path = path_match.group(1)
+                    self.analysis_result['handlers'][path] += 1
+
+            # 提取安全事件
+            if log_level == 'ERROR' and message and '高危文件类型' in message:
+                filename_match = UPLOAD_FAILED_PATTERN.search(message)
+                if filename_match:
+                    filename = filename_match.group(1)
+                    _, dot, file_ext = filename.rpartition('.')
+                    if not dot:
+                        file_ext = 'unknown'
+                    user_match = USER_MESSAGE_PATTERN.search(message)
+                    if user_match:
+                        user = user_match.group(1)
+                        self.analysis_result['security_events'].append({
+                            'timestamp': timestamp,
+                            'user': user,
+                            'filename': filename,
+                            'type': '高危文件拦截',
+                            'extension': file_ext
+                        })
 
     def generate_visualizations(self):
         """
@@ -221,136 +491,112 @@ class AdvancedLogAnalyzer:
         该方法使用 Plotly 库生成多个子图，直观展示日志分析的各项统计结果，帮助用户快速理解数据。
         """
         # 检查是否有日志数据
-        if not any(self.log_data.values()):
+        if not any(columns['timestamp'] for columns in self.log_data.values()):
             print("警告: 没有解析到任何日志数据，无法生成可视化图表。")
             return
 
-        # 创建子图网格
-        fig = make_subplots(
-            rows=3, cols=3,
-            subplot_titles=(
-                "每小时请求量热力图", "状态码分布", "请求方法分布",
-                "日志级别分布", "TOP 10活跃用户", "协议类型分布",
-                "安全事件统计", "文件类型分布", "下载统计"
-            ),
-            specs=[
-                [{'type': 'heatmap'}, {'type': 'pie'}, {'type': 'bar'}],
-                [{'type': 'bar'}, {'type': 'bar'}, {'type': 'pie'}],
-                [{'type': 'bar'}, {'type': 'pie'}, {'type': 'bar'}]
-            ]
-        )
+        # plotly 与 pandas 导入耗时长、占用内存多，只在生成图表时导入（之后由 sys.modules 缓存），
+        # 仅做解析或只生成报告时不必承担这部分开销
+        import pandas as pd
+        import plotly.express as px
+        import plotly.graph_objects as go
+        import plotly.io as pio
+
+        # 子图网格与整体布局每次都相同，复制缓存的图表骨架后只需加入数据
+        fig = go.Figure(_figure_skeleton())
+
+        # 各子图的图表先收集到列表（与子图网格按行、列一一对应），最后一次 add_traces 加入图表，
+        # 避免逐个 add_trace 时每次都重新校验布局和查找子图网格
+        traces = []
 
         # 每小时请求量热力图
         time_data = pd.DataFrame.from_dict(self.analysis_result['time_distribution'], orient='index').reset_index()
         time_data.columns = ['Hour', 'Count']
-        fig.add_trace(go.Heatmap(
+        traces.append(go.Heatmap(
             x=time_data['Hour'],
             y=['Count'],
             z=[time_data['Count']],
             colorscale='Viridis',
             showscale=False
-        ), row=1, col=1)
+        ))
 
         # 状态码分布
         status_codes = self.analysis_result['status_codes']
-        fig.add_trace(go.Pie(
+        traces.append(go.Pie(
             labels=list(status_codes.keys()),
             values=list(status_codes.values()),
             marker=dict(colors=px.colors.sequential.Blues)
-        ), row=1, col=2)
+        ))
 
         # 请求方法分布
         methods = self.analysis_result['request_types']
-        fig.add_trace(
-            go.Bar(
-                x=list(methods.keys()),
-                y=list(methods.values()),
-                marker=dict(color=px.colors.qualitative.Plotly)
-            ),
-            row=1, col=3
-        )
+        traces.append(go.Bar(
+            x=list(methods.keys()),
+            y=list(methods.values()),
+            marker=dict(color=px.colors.qualitative.Plotly)
+        ))
 
         # 日志级别分布
         levels = self.analysis_result['log_levels']
-        fig.add_trace(
-            go.Bar(
-                x=list(levels.keys()),
-                y=list(levels.values()),
-                marker=dict(color=px.colors.qualitative.Pastel)
-            ),
-            row=2, col=1
-        )
+        traces.append(go.Bar(
+            x=list(levels.keys()),
+            y=list(levels.values()),
+            marker=dict(color=px.colors.qualitative.Pastel)
+        ))
 
         # TOP 10活跃用户
-        user_data = sorted(
-            [(user, count) for user, count in self.analysis_result['users'].items()],
-            key=lambda x: x[1], reverse=True
-        )[:10]
-        fig.add_trace(go.Bar(
+        user_data = heapq.nlargest(10, self.analysis_result['users'].items(), key=itemgetter(1))
+        traces.append(go.Bar(
             x=[u[0] for u in user_data],
             y=[u[1] for u in user_data],
             marker=dict(color=px.colors.sequential.Tealgrn)
-        ), row=2, col=2)
+        ))
 
         # 协议类型分布
         protocols = self.analysis_result['protocols']
-        fig.add_trace(go.Pie(
+        traces.append(go.Pie(
             labels=list(protocols.keys()),
             values=list(protocols.values()),
             marker=dict(colors=px.colors.sequential.Reds)
-        ), row=2, col=3)
+        ))
 
         # 高危文件拦截统计
         security_events = defaultdict(int)
         for event in self.analysis_result['security_events']:
             security_events[event['extension']] += 1
-        fig.add_trace(go.Bar(
+        traces.append(go.Bar(
             x=list(security_events.keys()),
             y=list(security_events.values()),
             marker=dict(color=px.colors.sequential.Purples)
-        ), row=3, col=1)
+        ))
 
         # 文件类型分布
         file_types = self.analysis_result['file_types']
-        fig.add_trace(go.Pie(
+        traces.append(go.Pie(
             labels=list(file_types.keys()),
             values=list(file_types.values()),
             marker=dict(colors=px.colors.qualitative.Alphabet)
-        ), row=3, col=2)
+        ))
 
         # 下载统计 (前5文件)
-        download_stats = dict(sorted(self.analysis_result['download_stats'].items(), key=lambda x: x[1], reverse=True))
-        top_downloads = dict(list(download_stats.items())[:5])
-        fig.add_trace(go.Bar(
+        top_downloads = dict(self.analysis_result['download_stats'].most_common(5))
+        traces.append(go.Bar(
             x=list(top_downloads.keys()),
             y=list(top_downloads.values()),
             marker=dict(color=px.colors.sequential.Greens)
-        ), row=3, col=3)
-
-        # 更新布局
-        fig.update_layout(
-            height=1200,
-            width=1200,
-            title_text="综合日志分析可视化",
-            template="plotly_dark",
-            plot_bgcolor="#111827",
-            paper_bgcolor="#111827",
-            font=dict(color="white", family="Arial, sans-serif"),
-            margin=dict(l=40, r=40, t=80, b=40),
-            showlegend=False
-        )
+        ))
 
-        # 保存图表 判断是否为打包环境
-        if getattr(sys, 'frozen', False):
-            base_dir = Path(sys.executable).parent
-        else:
-            base_dir = Path(__file__).parent.parent
+        # 按 3x3 网格逐行放置各子图
+        fig.add_traces(traces, rows=[1, 1, 1, 2, 2, 2, 3, 3, 3], cols=[1, 2, 3] * 3)
 
-        web_dir = base_dir / 'web'
+        # 保存图表（Web 目录由 PathManager 解析一次后缓存，并已区分打包环境）
+        web_dir = PathManager.get_web_folder()
         web_dir.mkdir(exist_ok=True)  # 确保目录存在
         output_path = web_dir / 'full_analysis.html'
 
-        pio.write_html(fig, file=output_path, auto_open=False)
+        # 引用静态资源目录中的 plotly.js 而非内嵌；图表由上方代码构造，跳过 plotly 的属性校验
+        pio.write_html(fig, file=output_path, auto_open=False,
+                       include_plotlyjs=_plotly_bundle_src(), validate=False)
 
     def generate_report(self):
         """
@@ -359,48 +605,18 @@ class AdvancedLogAnalyzer:
         """
         # 计算总请求量
         total_requests = sum(self.analysis_result['time_distribution'].values())
-        if self.log_data['access']:
+        access_response_times = self.log_data['access']['response_time']
+        if access_response_times:
             # 计算平均响应时间
-            average_response_time = f"{sum(entry['response_time'] for entry in self.log_data['access']) / len(self.log_data['access']):.2f}ms"
+            average_response_time = f"{sum(access_response_times) / len(access_response_times):.2f}ms"
         else:
             average_response_time = "0.00ms"
 
-        # 安全事件表格
-        security_table = "<table><tr><th>时间</th><th>用户</th><th>事件类型</th><th>文件名称</th></tr>"
-        for event in self.analysis_result['security_events'][:5]:
-            filename = event['filename'][:20] + "..." if len(event['filename']) > 20 else event['filename']
-            security_table += f"<tr><td>{event['timestamp'].strftime('%Y-%m-%d %H:%M')}</td><td>{event['user']}</td><td>{event['type']}</td><td>{filename}</td></tr>"
-        security_table += "</table>"
-
-        # 热门接口表格
-        handler_table = "<table><tr><th>接口路径</th><th>调用次数</th></tr>"
-        for path, count in sorted(self.analysis_result['handlers'].items(), key=lambda x: x[1], reverse=True)[:5]:
-            handler_table += f"<tr><td>{path}</td><td>{count}</td></tr>"
-        handler_table += "</table>"
-
-        # 文件类型表格
-        file_type_table = "<table><tr><th>文件类型</th><th>下载次数</th></tr>"
-        for ext, count in sorted(self.analysis_result['file_types'].items(), key=lambda x: x[1], reverse=True):
-            file_type_table += f"<tr><td>{ext}</td><td>{count}</td></tr>"
-        file_type_table += "</table>"
-
-        # 下载统计表格
-        download_stats = dict(sorted(self.analysis_result['download_stats'].items(), key=lambda x: x[1], reverse=True))
-        top_downloads = dict(list(download_stats.items())[:5])
-        download_table = "<table><tr><th>文件名</th><th>下载次数</th></tr>"
-        for filename, count in top_downloads.items():
-            download_table += f"<tr><td>{filename}</td><td>{count}</td></tr>"
-        download_table += "</table>"
-
-        # TOP用户表格
-        user_data = sorted(
-            [(user, count) for user, count in self.analysis_result['users'].items()],
-            key=lambda x: x[1], reverse=True
-        )[:10]
-        user_table = "<table><tr><th>用户</th><th>请求次数</th></tr>"
-        for user, count in user_data:
-            user_table += f"<tr><td>{user}</td><td>{count}</td></tr>"
-        user_table += "</table>"
+        # 只取前 N 项的表格用堆做部分排序（Counter.most_common / heapq.nlargest），结果与完整排序后切片一致
+        top_handlers = self.analysis_result['handlers'].most_common(5)
+        file_types = sorted(self.analysis_result['file_types'].items(), key=lambda x: x[1], reverse=True)
+        top_downloads = self.analysis_result['download_stats'].most_common(5)
+        user_data = heapq.nlargest(10, self.analysis_result['users'].items(), key=itemgetter(1))
 
         # 响应时间统计
         response_times = self.analysis_result['response_times']
@@ -411,201 +627,134 @@ class AdvancedLogAnalyzer:
         else:
             avg_response_time = max_response_time = min_response_time = 0
 
-        # 生成报告
-        report_html = f"""
-        <!DOCTYPE html>
-        <html lang="zh-CN">
-        <head>
-            <meta charset="UTF-8">
-            <meta name="viewport" content="width=device-width, initial-scale=1.0">
-            <link rel="icon" href="assets/img/favicon.ico">
-            <title>综合日志分析报告 | 峰云共享</title>
-            <style>
-                body {{
-                    font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-                    margin: 20px;
-                    background-color: #111827;
-                    color: #e5e7eb;
-                }}
-                h1 {{
-                    color: #ffffff;
-                    text-align: center;
-                    margin-bottom: 30px;
-                    font-size: 2.5rem;
-                }}
-                h2 {{
-                    color: #a3a3a3;
-                    margin-top: 20px;
-                    margin-bottom: 15px;
-                    font-size: 1.8rem;
-                    border-bottom: 1px solid #2d3748;
-                    padding-bottom: 10px;
-                }}
-                p {{
-                    margin-bottom: 10px;
-                    font-size: 16px;
-                    line-height: 1.6;
-                }}
-                table {{
-                    width: 100%;
-                    border-collapse: collapse;
-                    margin-bottom: 30px;
-                    background-color: #1f2937;
-                    border-radius: 8px;
-                    overflow: hidden;
-                    box-shadow: 0 4px 6px rgba(0, 0, 0, 0.3);
-                }}
-                th, td {{
-                    padding: 15px;
-                    text-align: left;
-                    border-bottom: 1px solid #2d3748;
-                }}
-                th {{
-                    background-color: #1e293b;
-                    color: #cbd5e1;
-                }}
-                tr:nth-child(even) {{
-                    background-color: #1f2937;
-                }}
-                tr:hover {{
-                    background-color: #2d3748;
-                }}
-                iframe {{
-                    width: 100%;
-                    height: 1000px;
-                    border: none;
-                    border-radius: 8px;
-                    box-shadow: 0 4px 6px rgba(0, 0, 0, 0.3);
-                }}
-                .container {{
-                    max-width: 1200px;
-                    margin: 0 auto;
-                    padding: 20px;
-                }}
-                .header {{
-                    text-align: center;
-                    margin-bottom: 40px;
-                }}
-                .footer {{
-                    text-align: center;
-                    margin-top: 40px;
-                    color: #6b7280;
-                    font-size: 14px;
-                }}
-                .stats-grid {{
-                    display: grid;
-                    grid-template-columns: repeat(2, 1fr);
-                    gap: 20px;
-                    margin-bottom: 30px;
-                }}
-                .stat-card {{
-                    background-color: #1f2937;
-                    padding: 20px;
-                    border-radius: 8px;
-                    box-shadow: 0 4px 6px rgba(0, 0, 0, 0.3);
-                }}
-                .stat-title {{
-                    font-size: 1.2rem;
-                    color: #a3a3a3;
-                    margin-bottom: 10px;
-                }}
-                .stat-value {{
-                    font-size: 2rem;
-                    color: #ffffff;
-                    font-weight: bold;
-                }}
-                /* 添加返回主页按钮样式 */
-                .home-button {{
-                    display: inline-block;
-                    background-color: #3b82f6;
-                    color: #ffffff;
-                    padding: 10px 20px;
-                    border-radius: 8px;
-                    text-decoration: none;
-                    font-size: 16px;
-                    margin-bottom: 20px;
-                }}
-                .home-button:hover {{
-                    background-color: #2563eb;
-                }}
-                .footer-link{{
-                    color:#3b82f6;
-                    text-decoration: none;
-                }}
-                .footer-link{{
-                    text-decoration: underline;
-                }}
-            </style>
-            <link rel="preload" as="style" href="assets/css/styles.css" onload="this.rel='stylesheet'">
-            <link rel="stylesheet" href="assets/css/styles.css">
-        </head>
-        <body>
-            <div class="container">
-                <div class="header">
-                    <span>
-                        <h1>综合日志分析报告</h1>
-                        <a href="/" class="home-button">返回主页</a>
-                    </span>
-                </div>
-
-                <div class="stats-grid">
-                    <div class="stat-card">
-                        <div class="stat-title">总请求量</div>
-                        <div class="stat-value">{total_requests}</div>
-                    </div>
-                    <div class="stat-card">
-                        <div class="stat-title">平均响应时间</div>
-                        <div class="stat-value">{average_response_time}</div>
-                    </div>
-                    <div class="stat-card">
-                        <div class="stat-title">最大响应时间</div>
-                        <div class="stat-value">{max_response_time:.2f}ms</div>
-                    </div>
-                    <div class="stat-card">
-                        <div class="stat-title">最小响应时间</div>
-                        <div class="stat-value">{min_response_time:.2f}ms</div>
-                    </div>
-                </div>
-
-                <h2>TOP 10活跃用户</h2>
-                {user_table}
-
-                <h2>安全事件统计</h2>
-                {security_table}
-
-                <h2>热门接口统计</h2>
-                {handler_table}
-
-                <h2>文件类型统计</h2>
-                {file_type_table}
-
-                <h2>下载统计 (前5文件)</h2>
-                {download_table}
-
-                <h2>完整分析图表</h2>
-                <iframe src="full_analysis.html"></iframe>
-
-                <div class="footer">
-                    <p>生成时间: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}</p>
-                    <p>&copy; <span id="current-year"></span>-<span id="next-current-year"></span>
-                        <a href="https://dcyyd.github.io" class="footer-link" target="_blank">D.C.Y</a>
-                             | <span
-                            data-lang-key="footer_version">v2.0.0</span> |
-                        <span data-lang-key="footer_internal_system">PeakCloud Internal System</span></p>
-                </div>
-            </div>
-        </body>
-        <script src="assets/js/scripts.js"></script>
-        </html>
-        """
-        # 保存报告 判断是否为打包环境
-        if getattr(sys, 'frozen', False):
-            base_dir = Path(sys.executable).parent
-        else:
-            base_dir = Path(__file__).parent.parent
+        # 生成报告：由编译好的模板渲染，表格行在模板中循环生成
+        report_html = _report_template().render(
+            total_requests=total_requests,
+            average_response_time=average_response_time,
+            max_response_time=max_response_time,
+            min_response_time=min_response_time,
+            users=user_data,
+            security_events=self.analysis_result['security_events'][:5],
+            handlers=top_handlers,
+            file_types=file_types,
+            downloads=top_downloads,
+            generated_at=datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        )
 
-        web_dir = base_dir / 'web'
+        # 保存报告（Web 目录由 PathManager 解析一次后缓存，并已区分打包环境）
+        web_dir = PathManager.get_web_folder()
         web_dir.mkdir(exist_ok=True)  # 确保目录存在
         output_path = web_dir / 'report.html'
         with open(output_path, 'w', encoding='utf-8') as f:
             f.write(report_html)
+
+
+class LogReportCache:
+    """
+    日志分析报告缓存，避免每次访问都重新解析全部日志并生成报告。
+
+    按日志文件的 (inode, 大小, 修改时间) 判断是否需要更新：
+    - 所有日志均未变化且报告已存在时直接复用；
+    - 日志仅追加内容时只解析新增部分；
+    - 日志被轮转或截断时重新全量解析。
+    文件状态同时写入旁路 JSON 文件，进程重启或多进程部署时可复用已生成的报告。
+    """
+
+    def __init__(self, log_files, report_path, state_path):
+        """
+        参数:
+            log_files (dict): 日志类型到日志文件路径的映射。
+            report_path (Path): 生成的报告文件路径。
+            state_path (Path): 保存日志文件状态的旁路 JSON 文件路径。
+        """
+        self.log_files = log_files
+        self.report_path = Path(report_path)
+        self.state_path = Path(state_path)
+        self._lock = threading.Lock()
+        self._analyzer = None
+        self._offsets = {}
+        self._signatures = {}
+        # 最近一次生成报告各阶段耗时（毫秒），供调用方合并为一条日志输出
+        self.phases = {}
+
+    @staticmethod
+    def _signature(path):
+        """返回日志文件状态 [inode, 大小, 修改时间]，文件不存在时返回 None"""
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            return None
+        return [st.st_ino, st.st_size, st.st_mtime_ns]
+
+    def _load_state(self):
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _save_state(self, signatures):
+        # 旁路状态仅用于跨进程复用报告，写入失败不影响本次结果
+        try:
+            with open(self.state_path, 'w', encoding='utf-8') as f:
+                json.dump(signatures, f)
+        except OSError:
+            pass
+
+    def _rotated(self, log_type, signature):
+        """判断日志自上次解析后是否被轮转、截断或删除"""
+        previous = self._signatures.get(log_type)
+        if previous is None:
+            return False
+        return signature is None or signature[0] != previous[0] or signature[1] < self._offsets.get(log_type, 0)
+
+    def refresh(self):
+        """
+        按需更新报告。
+
+        gevent 协程模式下，解析与报告生成交给 hub 的原生线程池执行，
+        不在 hub 上长时间占用CPU，同一工作进程内的其他请求仍可继续处理。
+
+        返回:
+            bool: 本次是否重新生成了报告。
+        """
+        with self._lock:
+            signatures = {log_type: self._signature(path) for log_type, path in self.log_files.items()}
+            if self.report_path.exists():
+                if signatures == self._signatures:
+                    return False
+                # 进程内尚无解析结果时，以旁路文件记录的状态判断已有报告是否仍然有效
+                if self._analyzer is None and signatures == self._load_state():
+                    self._signatures = signatures
+                    return False
+
+            if self._analyzer is None or any(self._rotated(t, sig) for t, sig in signatures.items()):
+                self._analyzer = AdvancedLogAnalyzer()
+                self._offsets = {}
+
+            if _gevent_patched():
+                gevent.get_hub().threadpool.apply(self._rebuild, (signatures,))
+            else:
+                self._rebuild(signatures)
+            return True
+
+    def _rebuild(self, signatures):
+        """增量解析日志并重新生成报告（调用方持有 self._lock）"""
+        start = time.perf_counter()
+        self._offsets.update(self._analyzer.parse_files({
+            log_type: (path, self._offsets.get(log_type, 0))
+            for log_type, path in self.log_files.items()
+            if signatures[log_type] is not None
+        }))
+        phases = {'parse': time.perf_counter()}
+        self._analyzer.analyze_logs()
+        phases['analyze'] = time.perf_counter()
+        self._analyzer.generate_visualizations()
+        phases['visualize'] = time.perf_counter()
+        self._analyzer.generate_report()
+        phases['report'] = time.perf_counter()
+        for name, end in phases.items():
+            phases[name], start = round((end - start) * 1000, 2), end
+        self.phases = phases
+        self._signatures = signatures
+        self._save_state(signatures)
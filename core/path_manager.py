@@ -12,6 +12,7 @@
 """
 
 import sys
+from functools import lru_cache
 from pathlib import Path
 
 
@@ -21,7 +22,7 @@ class PathManager:
 
     特性：
     - 环境自适应：自动区分开发环境与打包环境（如cx_Freeze）
-    - 路径统一管理：通过属性方法获取各类系统路径
+    - 路径统一管理：通过属性方法获取各类系统路径（路径不变，首次调用后缓存）
     - 安全初始化：自动创建必要目录结构，确保系统运行基础
 
     使用示例：
@@ -30,6 +31,7 @@ class PathManager:
     """
 
     @staticmethod
+    @lru_cache(maxsize=None)
     def get_base_path() -> Path:
         """
         动态获取项目根路径
@@ -37,6 +39,7 @@ class PathManager:
         实现逻辑：
         - 开发环境：返回当前文件父目录的上级目录（项目根目录）
         - 打包环境：返回可执行文件所在目录
+        - 结果在进程内缓存，路径只解析一次
 
         Returns:
             Path: 项目根路径对象
@@ -53,6 +56,7 @@ class PathManager:
         return base_path
 
     @staticmethod
+    @lru_cache(maxsize=None)
     def get_upload_folder() -> Path:
         """
         获取文件上传存储目录路径
@@ -66,6 +70,7 @@ class PathManager:
         return PathManager.get_base_path() / 'uploads'
 
     @staticmethod
+    @lru_cache(maxsize=None)
     def get_users_file() -> Path:
         """
         获取用户数据文件绝对路径
@@ -82,12 +87,13 @@ class PathManager:
         return PathManager.get_base_path() / 'mapper/users.json'
 
     @staticmethod
+    @lru_cache(maxsize=None)
     def get_log_folder() -> Path:
         """
         获取日志文件存储目录路径
 
         路径结构：
-        - {项目根目录}/log/
+        - {项目根目录}/logs/
 
         Returns:
             Path: 日志目录路径对象
@@ -95,6 +101,7 @@ class PathManager:
         return PathManager.get_base_path() / 'logs'
 
     @staticmethod
+    @lru_cache(maxsize=None)
     def get_web_folder() -> Path:
         """
         获取前端资源根目录路径
@@ -111,6 +118,7 @@ class PathManager:
         return PathManager.get_base_path() / 'web'
 
     @staticmethod
+    @lru_cache(maxsize=None)
     def get_assets_folder() -> Path:
         """
         获取静态资源目录路径
@@ -127,6 +135,7 @@ class PathManager:
         return PathManager.get_base_path() / 'web/assets'
 
     @staticmethod
+    @lru_cache(maxsize=None)
     def get_cert_folder() -> Path:
         """
         获取证书存储目录路径
@@ -140,6 +149,7 @@ class PathManager:
         return PathManager.get_base_path() / 'certs'
 
     @classmethod
+    @lru_cache(maxsize=None)
     def get_cert_file(cls):
         """
         获取服务器证书文件路径
@@ -147,6 +157,7 @@ class PathManager:
         return cls.get_cert_folder() / 'server.crt'
 
     @classmethod
+    @lru_cache(maxsize=None)
     def get_cert_key(cls):
         """
         获取服务器证书密钥文件路径
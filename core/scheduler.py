@@ -12,7 +12,10 @@
 """
 
 import logging
-from datetime import datetime
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from operator import itemgetter
 from pathlib import Path
 from threading import Thread, Event
 
@@ -20,6 +23,19 @@ from core.path_manager import PathManager
 
 logger = logging.getLogger(__name__)
 
+# 并发删除过期文件的最大线程数（unlink 为阻塞的元数据系统调用，等待期间释放 GIL，可多线程重叠执行）
+CLEANUP_MAX_WORKERS = 8
+# 每批提交删除的文件数，批次之间检查停止事件，清理大量文件时也能及时响应停止
+CLEANUP_BATCH_SIZE = 256
+# 过期文件数超过该值时按 inode 号排序后再删除：相邻 inode 的元数据在磁盘上也相邻，
+# 机械硬盘上可减少随机寻道；文件很少时排序没有收益，直接按目录顺序删除
+CLEANUP_SORT_MIN_FILES = 64
+# 停止调度器时等待清理线程退出的最长时间（秒）
+STOP_JOIN_TIMEOUT = 30
+# 平台支持按目录文件描述符遍历和删除时（如 Linux 的 getdents64/fstatat/unlinkat），
+# 清理时只打开一次目录，之后按文件名相对该目录 stat 和删除，内核无需为每个文件重新解析完整路径
+DIR_FD_SWEEP = os.scandir in os.supports_fd and os.unlink in os.supports_dir_fd
+
 
 class CleanupScheduler:
     """智能文件清理调度器
@@ -35,21 +51,28 @@ class CleanupScheduler:
         upload_folder (Path): 需要清理的目录路径。
         _stop_event (Event): 用于控制任务停止的事件对象。
         _thread (Thread): 执行清理任务的线程对象。
+        _pool (ThreadPoolExecutor): 并发删除过期文件的线程池。
     """
 
-    def __init__(self, interval: int, retention: float, upload_folder: Path):
+    def __init__(self, interval: int, retention: float, upload_folder: Path, tasks=()):
         """初始化清理调度器
 
         Args:
             interval (int): 清理任务执行间隔，单位为秒。
             retention (float): 文件保留时间，单位为秒。
             upload_folder (Path): 需要清理的目录路径。
+            tasks (Iterable[Callable[[], None]]): 附加的周期清理任务，每轮文件清理后依次执行。
         """
         self.interval = interval
         self.retention = retention
+        self.tasks = tuple(tasks)
         self.upload_folder = PathManager.get_upload_folder()
+        # 目录路径的字符串形式只转换一次，每轮清理直接传给 os.open/os.scandir
+        self._upload_folder_str = os.fspath(self.upload_folder)
         self._stop_event = Event()
         self._thread = None
+        # 线程池按需创建工作线程，没有过期文件时不会启动任何线程
+        self._pool = ThreadPoolExecutor(max_workers=CLEANUP_MAX_WORKERS, thread_name_prefix="cleanup")
         # logger.info(f"初始化文件清理调度器，间隔: {interval} 秒，保留时间: {retention} 秒，目录: {os.path.relpath(PathManager.get_upload_folder())}")
 
     def start(self):
@@ -74,11 +97,16 @@ class CleanupScheduler:
         会设置停止事件，等待当前任务完成后再停止线程，确保任务的安全终止。
 
         Note:
-            会等待当前任务完成后再停止。
+            最多等待 STOP_JOIN_TIMEOUT 秒，清理线程仍未退出时记录警告后继续，避免退出流程被挂起。
         """
         self._stop_event.set()
         if self._thread:
-            self._thread.join()
+            self._thread.join(timeout=STOP_JOIN_TIMEOUT)
+            if self._thread.is_alive():
+                logger.warning(f"清理任务未在 {STOP_JOIN_TIMEOUT} 秒内结束，不再等待")
+                self._pool.shutdown(wait=False, cancel_futures=True)
+                return
+        self._pool.shutdown(wait=True)
         logger.info("清理任务已停止")
 
     def _run(self):
@@ -89,33 +117,69 @@ class CleanupScheduler:
         Note:
             捕获所有异常确保线程不会意外终止。
         """
+        # 按绝对截止时间调度（单调时钟），清理耗时不会累积到执行周期上
+        deadline = time.monotonic() + self.interval
         while not self._stop_event.is_set():
             try:
                 self._cleanup_files()
             except Exception as e:
                 logger.error(f"清理任务异常: {str(e)}")
-            self._stop_event.wait(self.interval)
+            for task in self.tasks:
+                try:
+                    task()
+                except Exception as e:
+                    logger.error(f"清理任务异常: {str(e)}")
+            timeout = deadline - time.monotonic()
+            if timeout > 0:
+                self._stop_event.wait(timeout)
+                deadline += self.interval
+            else:
+                # 本轮清理超出了一个周期，从当前时间起重新对齐下一次执行
+                deadline = time.monotonic() + self.interval
 
     def _cleanup_files(self):
         """安全清理过期文件
 
-        计算截止时间，遍历指定目录下的所有文件，删除修改时间早于截止时间的文件，并在出现错误时记录日志。
+        计算截止时间，遍历指定目录下的所有文件，收集修改时间早于截止时间的文件后交给线程池并发删除，
+        并在出现错误时记录日志。
 
         Raises:
             Exception: 当清理过程中发生错误时记录日志。
         """
         try:
-            # 计算截止时间，即当前时间减去文件保留时间
-            cutoff = datetime.now().timestamp() - self.retention
-            # 遍历指定目录下的所有文件和文件夹
-            for entry in self.upload_folder.iterdir():
-                # 检查是否为文件且修改时间早于截止时间
-                if entry.is_file() and entry.stat().st_mtime < cutoff:
-                    try:
-                        # 删除过期文件
-                        entry.unlink()
-                        logger.info(f"已清理文件: {entry.name}")
-                    except Exception as e:
-                        logger.error(f"清理失败: {entry.name} - {str(e)}")
+            # 计算截止时间，即当前时间减去文件保留时间（与 st_mtime 比较，需使用墙上时钟而非单调时钟）
+            cutoff = time.time() - self.retention
+            dir_fd = None
+            if DIR_FD_SWEEP:
+                dir_fd = os.open(self._upload_folder_str, os.O_RDONLY | getattr(os, 'O_DIRECTORY', 0))
+            try:
+                # 遍历指定目录下的所有文件和文件夹；os.scandir 复用读取目录时得到的文件类型，
+                # 判断是否为普通文件无需额外的 stat 调用，每个条目最多只 stat 一次
+                # （按目录描述符遍历时 entry.path 即文件名，stat 与删除都相对该目录进行）
+                with os.scandir(self._upload_folder_str if dir_fd is None else dir_fd) as entries:
+                    # 检查是否为文件且修改时间早于截止时间
+                    expired = [(entry.inode(), entry.name, entry.path) for entry in entries
+                               if entry.is_file(follow_symlinks=False)
+                               and entry.stat(follow_symlinks=False).st_mtime < cutoff]
+                # inode 号在 Linux 上直接来自目录项，无需额外系统调用
+                if len(expired) > CLEANUP_SORT_MIN_FILES:
+                    expired.sort(key=itemgetter(0))
+                # 删除过期文件：各文件的删除互不依赖，分批提交到线程池并发执行，批次之间收到停止信号则中止
+                for start in range(0, len(expired), CLEANUP_BATCH_SIZE):
+                    if self._stop_event.is_set():
+                        logger.info("收到停止信号，中止本轮文件清理")
+                        break
+                    batch = expired[start:start + CLEANUP_BATCH_SIZE]
+                    futures = {self._pool.submit(os.unlink, path, dir_fd=dir_fd): name for _, name, path in batch}
+                    for future in as_completed(futures):
+                        name = futures[future]
+                        try:
+                            future.result()
+                            logger.info(f"已清理文件: {name}")
+                        except Exception as e:
+                            logger.error(f"清理失败: {name} - {str(e)}")
+            finally:
+                if dir_fd is not None:
+                    os.close(dir_fd)
         except Exception as e:
             logger.error(f"文件清理失败: {str(e)}")
@@ -11,10 +11,24 @@
 """
 
 import logging
-from datetime import datetime
+import time
+from functools import lru_cache
 
 logger = logging.getLogger(__name__)
 
+# 文件大小单位及对应的换算除数（1024 的幂）
+SIZE_UNITS = ('B', 'KB', 'MB', 'GB', 'TB')
+SIZE_DIVISORS = tuple(1024.0 ** i for i in range(len(SIZE_UNITS)))
+# 按整数二进制位数预先算好的单位下标（每 10 位对应一级单位），超出表长的按最大单位处理
+SIZE_UNIT_INDEX = tuple(min(max(bits - 1, 0) // 10, len(SIZE_UNITS) - 1)
+                        for bits in range(10 * len(SIZE_UNITS) + 1))
+
+
+@lru_cache(maxsize=4096)
+def _format_second(second: int) -> str:
+    """按整秒缓存时间戳格式化结果（文件列表中大量条目共享相近的时间），直接用 time.strftime 格式化，不构造 datetime 对象"""
+    return time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(second))
+
 
 class FormatUtils:
     """
@@ -42,17 +56,12 @@ class FormatUtils:
 
         Notes:
             - 支持的单位包括 B、KB、MB、GB 和 TB。
-            - 每个单位之间的转换因子为 1024。
+            - 每个单位之间的转换因子为 1024，超过 1024 TB 时仍以 TB 表示。
         """
-        # 定义文件大小单位
-        units = ('B', 'KB', 'MB', 'GB', 'TB')
-        # 单位转换因子
-        factor = 1024.0
-        for unit in units:
-            if size_bytes < factor:
-                return f"{size_bytes:.1f} {unit}"
-            size_bytes /= factor
-        return f"{size_bytes:.1f} {units[-1]}"
+        # 按二进制位数查表定位单位，一次除以对应的 1024 的幂，无需逐级循环除法
+        bits = int(size_bytes).bit_length()
+        index = SIZE_UNIT_INDEX[bits] if bits < len(SIZE_UNIT_INDEX) else len(SIZE_UNITS) - 1
+        return f"{size_bytes / SIZE_DIVISORS[index]:.1f} {SIZE_UNITS[index]}"
 
     @staticmethod
     def timestamp(ts: float) -> str:
@@ -66,9 +75,53 @@ class FormatUtils:
             str: 格式化后的日期时间字符串，格式为 "YYYY-MM-DD HH:MM:SS"。
 
         Notes:
-            - 该方法使用 datetime 模块进行时间戳转换。
+            - 该方法使用 time.localtime 按本地时区转换时间戳，结果按整秒缓存。
+        """
+        return _format_second(int(ts // 1))
+
+    @staticmethod
+    def sizes(sizes_bytes) -> list:
+        """
+        批量格式化文件大小，按二进制位数直接确定每个条目的单位。
+
+        Args:
+            sizes_bytes (Iterable[int]): 文件大小序列，以字节为单位。
+
+        Returns:
+            list: 与输入顺序一致的格式化字符串列表。
+
+        Example:
+            >>> FormatUtils.sizes([512, 1500000])
+            ['512.0 B', '1.4 MB']
+
+        Notes:
+            - 结果与逐个调用 size() 一致。
+        """
+        # 整数的二进制位数每 10 位对应一级单位，查表直接定位单位，无需逐级除以 1024
+        last = len(SIZE_UNITS) - 1
+        limit = len(SIZE_UNIT_INDEX)
+        result = []
+        for value in sizes_bytes:
+            bits = int(value).bit_length()
+            index = SIZE_UNIT_INDEX[bits] if bits < limit else last
+            result.append(f"{value / SIZE_DIVISORS[index]:.1f} {SIZE_UNITS[index]}")
+        return result
+
+    @staticmethod
+    def timestamps(timestamps) -> list:
+        """
+        批量将 Unix 时间戳格式化为标准的日期时间字符串。
+
+        Args:
+            timestamps (Iterable[float]): Unix 时间戳序列。
+
+        Returns:
+            list: 与输入顺序一致的格式化字符串列表，格式为 "YYYY-MM-DD HH:MM:SS"。
+
+        Notes:
+            - 按本地时区格式化，与 timestamp() 一致。
         """
-        return datetime.fromtimestamp(ts).strftime('%Y-%m-%d %H:%M:%S')
+        return [_format_second(int(ts // 1)) for ts in timestamps]
 
 
 class Pagination:
@@ -106,20 +159,18 @@ class Pagination:
         if total_pages <= 5:
             return list(range(1, total_pages + 1))
 
-        pages = []
         # 计算当前页左侧的最小页码
         left = max(1, current - margin)
         # 计算当前页右侧的最大页码
         right = min(total_pages, current + margin)
 
-        # 如果左侧有省略页，添加起始页码和省略号
+        pages = []
+        # 如果左侧有未显示的页码，添加起始页码；与当前页附近的页码不相邻时再添加省略号
         if left > 1:
-            pages.extend([1, '...'])
+            pages += [1, '...'] if left > 2 else [1]
         # 添加当前页附近的页码
-        pages.extend(range(left, right + 1))
-        # 如果右侧有省略页，添加省略号和最后一页页码
+        pages += range(left, right + 1)
+        # 如果右侧有未显示的页码，添加最后一页页码；与当前页附近的页码不相邻时在其前添加省略号
         if right < total_pages:
-            pages.extend(['...', total_pages])
-
-        # 过滤掉无效的页码和省略号
-        return [x for x in pages if x not in ('...', 0)]
+            pages += ['...', total_pages] if right < total_pages - 1 else [total_pages]
+        return pages
@@ -0,0 +1,32 @@
+# -*- coding: utf-8 -*-
+
+"""
+@file gunicorn.conf.py
+@description gunicorn生产环境配置
+@functionality
+    - 默认每个CPU核心一个gevent工作进程
+    - 为工作进程分配稳定编号（GUNICORN_WORKER_ID），进程重启后复用原编号
+    - 未配置X-Accel-Redirect时，下载文件经wsgi.file_wrapper由sendfile(2)发送
+    - 各工作进程共用 logs/ 下的日志文件，写入与滚动由文件锁串行化
+@author D.C.Y <https://dcyyd.github.io>
+@version 1.2.1
+@license MIT
+@copyright © 2025 D.C.Y. All rights reserved.
+"""
+
+import itertools
+import os
+
+wsgi_app = 'wsgi:application'
+bind = os.getenv('PCS_BIND', '0.0.0.0:5000')
+workers = int(os.getenv('PCS_WORKERS', os.cpu_count() or 1))
+worker_class = 'gevent'
+# send_from_directory返回的文件包装对象直接交给内核sendfile发送（启用HTTPS时gunicorn自动回退为读写循环）
+sendfile = True
+
+
+def pre_fork(server, worker):
+    """在主进程fork前为工作进程分配最小的空闲编号，子进程通过环境变量继承"""
+    used = {getattr(w, 'pcs_worker_id', None) for w in server.WORKERS.values()}
+    worker.pcs_worker_id = next(i for i in itertools.count() if i not in used)
+    os.environ['GUNICORN_WORKER_ID'] = str(worker.pcs_worker_id)
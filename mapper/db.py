@@ -13,18 +13,35 @@
 """
 
 import logging
+import random
+import threading
+import time
+from functools import lru_cache
+
 import pymysql
 from dbutils.pooled_db import PooledDB
 from pymysql import cursors
-from pymysql.err import OperationalError
+from pymysql.err import InterfaceError, OperationalError
 
 # 从配置文件中导入数据库配置常量
 # 从配置文件集中管理数据库连接信息，便于维护和修改，符合商业代码可维护性原则
 from config import constants
 
-# 配置日志记录
-# 配置日志记录级别和格式，详细记录错误信息，为商业系统的运维和监控提供有力支持
-logging.basicConfig(level=logging.ERROR, format='%(asctime)s - %(levelname)s - %(message)s')
+# 模块日志器：级别和输出由应用统一配置，本模块不再修改根日志器；
+# 日志参数采用 % 占位符延迟格式化，被过滤的日志不会构造消息字符串
+logger = logging.getLogger(__name__)
+
+# 数据库操作重试的退避参数（秒）：第 n 次重试前等待 min(基数 * 2^(n-1), 上限) 再加随机抖动，
+# 避免故障切换期间立即连续重试、多个请求同时重试冲击数据库
+DB_RETRY_BACKOFF = 0.05
+DB_RETRY_BACKOFF_MAX = 2.0
+DB_RETRY_JITTER = 0.05
+
+
+@lru_cache(maxsize=256)
+def _is_select(query):
+    """判断语句是否为查询语句（SQL均为固定文本，按语句缓存结果，避免每次执行都复制并转换整条SQL）"""
+    return query.lstrip()[:6].lower() == 'select'
 
 
 class Database:
@@ -36,6 +53,8 @@ class Database:
     # 静态变量，用于存储数据库连接池
     # 静态变量确保在整个应用程序生命周期内只有一个连接池实例，实现资源的高效利用
     _pool = None
+    # 线程级状态：开启请求级复用后，本线程在请求期间绑定的连接（同一请求内的多次查询共用）
+    _local = threading.local()
 
     @classmethod
     def get_connection(cls):
@@ -74,19 +93,83 @@ class Database:
                     # 是否自动提交事务
                     autocommit=constants.DB_CONFIG['autocommit'],
                     # 连接池中空闲连接的初始数量
-                    mincached=constants.DB_CONFIG['pool_size'],
+                    mincached=constants.DB_CONFIG['min_cached'],
                     # 连接池中空闲连接的最大数量
-                    maxcached=constants.DB_CONFIG['pool_size']
+                    maxcached=constants.DB_CONFIG['pool_size'],
+                    # 连接总数上限（常驻连接 + 临时溢出连接）
+                    maxconnections=constants.DB_CONFIG['pool_size'] + constants.DB_CONFIG['max_overflow'],
+                    # 连接数达到上限时阻塞等待空闲连接
+                    blocking=constants.DB_CONFIG['pool_blocking'],
+                    # 取出连接时执行 ping 检测，失效连接自动重连
+                    ping=constants.DB_CONFIG['pool_ping'],
+                    # 自动提交模式下归还连接无需回滚，省去一次往返
+                    reset=not constants.DB_CONFIG['autocommit'],
+                    # 新建连接时设置会话空闲超时，池中空闲连接不会因服务端全局超时较短而被断开、需重新认证握手
+                    setsession=[f"SET SESSION wait_timeout = {int(constants.DB_CONFIG['wait_timeout'])}"]
                 )
             except Exception as e:
                 # 记录连接池初始化失败的详细信息
                 # 详细的错误日志有助于快速定位和解决问题，减少系统停机时间
-                logging.error(f"Failed to initialize database connection pool: {str(e)}")
+                logger.error("Failed to initialize database connection pool: %s", e)
                 raise
         return cls._pool.connection()
 
     @classmethod
-    def execute_query(cls, query, args=None, max_retries=3):
+    def begin_request(cls):
+        """
+        开启本线程的请求级连接复用（在请求开始时调用）。
+        此后本线程的查询在首次执行时从连接池取出一个连接并绑定，后续查询直接复用，
+        省去每次查询从连接池取出、归还连接的加锁与 ping 检测，直到 release_connection 归还。
+        """
+        cls._local.reuse = True
+
+    @classmethod
+    def release_connection(cls):
+        """
+        结束本线程的请求级连接复用，并将绑定的连接归还连接池（在请求结束时调用）。
+        未开启复用或未执行过查询时不做任何操作。
+        """
+        cls._local.reuse = False
+        cls._discard_connection()
+
+    @classmethod
+    def return_connection(cls):
+        """
+        提前将本线程绑定的连接归还连接池，请求级复用保持开启，之后的查询重新取出并绑定连接。
+        用于请求中耗时较长且不访问数据库的操作（如密码哈希）之前，避免长时间占用池连接。
+        """
+        cls._discard_connection()
+
+    @classmethod
+    def _discard_connection(cls):
+        """将本线程绑定的连接归还连接池并解除绑定"""
+        conn = getattr(cls._local, 'conn', None)
+        if conn is not None:
+            cls._local.conn = None
+            try:
+                conn.close()
+            except Exception as e:
+                logger.warning("Failed to release database connection: %s", e)
+
+    @staticmethod
+    def _execute(conn, query, args):
+        """在给定连接上执行语句，SELECT 返回所有查询结果，其他语句返回最后插入的行 ID"""
+        with conn.cursor() as cursor:
+            # 使用参数化查询，防止 SQL 注入
+            cursor.execute(query, args)
+            if _is_select(query):
+                # 如果是 SELECT 语句，返回所有查询结果；只读语句无需提交，
+                # 非自动提交模式下由连接池归还连接时的回滚结束事务
+                return cursor.fetchall()
+            # 非自动提交模式下仅对写语句提交（连接池归还连接时不会自动提交）
+            if not constants.DB_CONFIG['autocommit']:
+                conn.commit()
+            # 如果是其他语句（如 INSERT），返回最后插入的行 ID
+            return cursor.lastrowid
+
+    @classmethod
+    def execute_query(cls, query, args=None, max_retries=3, retry_on=(OperationalError, InterfaceError),
+                      stream=False, fetch_size=1000):
         """
         执行数据库查询或操作。
 
@@ -94,41 +177,100 @@ class Database:
             query (str): 要执行的 SQL 查询或操作语句。
             args (tuple, 可选): 查询参数，用于防止 SQL 注入。
             max_retries (int, 可选): 最大重试次数，默认为 3 次。
+            retry_on (tuple, 可选): 需要重试的异常类型，默认为操作错误和连接已断开的接口错误。
+            stream (bool, 可选): 是否以服务端游标流式读取 SELECT 结果，默认为 False。
+            fetch_size (int, 可选): 流式读取时每批从服务端取回的行数，默认为 1000。
 
         返回:
             list 或 int: 如果是 SELECT 语句，返回查询结果列表；如果是 INSERT 语句，返回插入的行 ID。
+            stream 为 True 时返回逐行产出查询结果的生成器。
 
         异常:
-            OperationalError: 数据库操作出错且达到最大重试次数时抛出。
+            OperationalError / InterfaceError: 数据库操作出错且达到最大重试次数时抛出。
 
         商业价值:
             - 参数化查询有效防止 SQL 注入，保护商业数据的安全和完整性。
             - 重试机制提高了数据库操作的成功率，减少了因临时故障导致的业务中断。
             - 详细的日志记录便于对数据库操作进行监控和审计，符合合规要求。
         """
+        if stream:
+            return cls._stream_query(query, args, fetch_size)
         retries = 0
         while retries < max_retries:
             try:
+                if getattr(cls._local, 'reuse', False):
+                    # 请求期间复用本线程绑定的连接，请求结束时由 release_connection 归还
+                    conn = getattr(cls._local, 'conn', None)
+                    if conn is None:
+                        conn = cls._local.conn = cls.get_connection()
+                    return cls._execute(conn, query, args)
                 # 从连接池获取连接，使用 with 语句确保连接和游标自动关闭
                 # 自动关闭连接和游标，避免资源泄漏，提高系统的稳定性
                 with cls.get_connection() as conn:
-                    with conn.cursor() as cursor:
-                        # 使用参数化查询，防止 SQL 注入
-                        cursor.execute(query, args)
-                        if query.strip().lower().startswith('select'):
-                            # 如果是 SELECT 语句，返回所有查询结果
-                            return cursor.fetchall()
-                        # 如果是其他语句（如 INSERT），返回最后插入的行 ID
-                        return cursor.lastrowid
-            except OperationalError as e:
+                    return cls._execute(conn, query, args)
+            except retry_on as e:
+                # 绑定的连接可能已失效，先归还，重试时重新从连接池获取
+                cls._discard_connection()
                 retries += 1
                 if retries < max_retries:
                     # 记录重试信息
                     # 记录重试信息有助于分析数据库操作的稳定性和性能瓶颈
-                    logging.warning(f"Database operation failed (attempt {retries}): {str(e)}. Retrying...")
+                    logger.warning("Database operation failed (attempt %d): %s. Retrying...", retries, e)
+                    # 指数退避并加随机抖动后再重试，给数据库留出恢复时间
+                    time.sleep(min(DB_RETRY_BACKOFF * (2 ** (retries - 1)), DB_RETRY_BACKOFF_MAX)
+                               + random.random() * DB_RETRY_JITTER)
                 else:
                     # 记录详细的数据库错误信息，方便后续排查问题
                     # 详细的错误日志是快速解决问题的关键，减少对业务的影响
-                    logging.error(f"Database error after {max_retries} attempts: {str(e)}")
+                    logger.error("Database error after %d attempts: %s", max_retries, e)
                     # 重新抛出异常，让调用者处理
                     raise
+
+    @classmethod
+    def execute_many(cls, query, seq_of_args):
+        """
+        批量执行同一条语句，适用于一次插入多行数据。
+
+        参数:
+            query (str): 要执行的 SQL 语句，形如 "INSERT INTO t (a, b) VALUES (%s, %s)" 时，
+                pymysql 会将多组参数改写为一条多 VALUES 的 INSERT，只需一次网络往返。
+            seq_of_args (Iterable[tuple]): 每行对应的参数序列。
+
+        返回:
+            int: 受影响的行数。
+
+        说明:
+            - 批量写入可能已部分生效，因此不做重试，出错时记录日志后抛出异常由调用者处理。
+        """
+        try:
+            with cls.get_connection() as conn:
+                with conn.cursor() as cursor:
+                    # 使用参数化查询，防止 SQL 注入
+                    cursor.executemany(query, seq_of_args)
+                    if not constants.DB_CONFIG['autocommit']:
+                        conn.commit()
+                    return cursor.rowcount
+        except Exception as e:
+            logger.error("Database batch operation failed: %s", e)
+            raise
+
+    @classmethod
+    def _stream_query(cls, query, args, fetch_size):
+        """
+        以服务端游标（SSDictCursor）流式执行 SELECT，按批取回并逐行产出结果。
+        结果集不会一次性全部加载到内存，适合行数很多的查询。
+
+        说明:
+            - 使用单独从连接池取出的连接，不占用请求期间绑定的连接；生成器耗尽或关闭时归还连接。
+            - 结果已开始产出后无法安全重试，因此流式查询不做重试。
+            - 调用方应尽快消费完结果，未读完前该连接无法执行其他语句。
+        """
+        with cls.get_connection() as conn:
+            with conn.cursor(cursors.SSDictCursor) as cursor:
+                # 使用参数化查询，防止 SQL 注入
+                cursor.execute(query, args)
+                while True:
+                    rows = cursor.fetchmany(fetch_size)
+                    if not rows:
+                        break
+                    yield from rows
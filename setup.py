@@ -24,6 +24,8 @@ include_files = [
     ("mapper", "mapper"),
     ("web", "web"),
     "app.py",
+    "wsgi.py",
+    "gunicorn.conf.py",
     "requirements.txt",
     "README.md",
     "LICENSE",
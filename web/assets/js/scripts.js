@@ -635,14 +635,62 @@ function handleFileSelect(e) {
  * 确保在表单提交时调用 handleFileSelect 函数，进行文件选择和高危文件检测。
  * 此功能确保用户在提交表单时上传的文件符合系统的安全要求，保护系统数据安全。
  */
-document.getElementById('upload-form').addEventListener('submit', function () {
+document.getElementById('upload-form').addEventListener('submit', function (e) {
     const fileInput = document.getElementById('file-input');
     const folderInput = document.getElementById('folder-input');
     if (fileInput.files.length > 0 || folderInput.files.length > 0) {
         handleFileSelect({target: {files: [...fileInput.files, ...folderInput.files]}});
     }
+
+    // 默认使用普通表单提交；仅选择了单个大文件且支持 fetch 时，改为以原始请求体流式上传
+    const files = [...fileInput.files, ...folderInput.files];
+    if (files.length === 1 && files[0].size >= STREAM_UPLOAD_MIN_SIZE && window.fetch) {
+        e.preventDefault();
+        uploadFilesStreaming(files, this);
+    }
 });
 
+// 单个文件达到该大小（字节）时才使用流式上传
+const STREAM_UPLOAD_MIN_SIZE = 100 * 1024 * 1024;
+
+// 流式上传
+/**
+ * 以 application/octet-stream 方式将每个文件直接 POST 到 /upload_stream/<相对路径>，
+ * 服务端无需解析 multipart 表单即可边接收边写入磁盘；最多同时上传 4 个文件。
+ * 上传结果由服务端写入提示消息，完成后刷新文件列表页面统一展示，与表单提交一致；
+ * 请求未能送达服务端时回退为普通表单提交。
+ * @param {File[]} files - 待上传的文件列表。
+ * @param {HTMLFormElement} form - 上传表单，流式上传失败时用于回退提交。
+ */
+async function uploadFilesStreaming(files, form) {
+    const queue = [...files];
+    let networkError = false;
+
+    async function worker() {
+        while (queue.length > 0) {
+            const file = queue.shift();
+            const relativePath = file.webkitRelativePath || file.name;
+            const url = '/upload_stream/' + relativePath.split('/').map(encodeURIComponent).join('/');
+            try {
+                await fetch(url, {
+                    method: 'POST',
+                    headers: {'Content-Type': 'application/octet-stream'},
+                    body: file
+                });
+            } catch (err) {
+                networkError = true;
+            }
+        }
+    }
+
+    await Promise.all(Array.from({length: Math.min(4, files.length)}, worker));
+    if (networkError) {
+        form.submit();
+        return;
+    }
+    window.location.href = '/';
+}
+
 // Toast提示关闭功能
 /**
  * 关闭指定的 Toast 提示框。
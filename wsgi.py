@@ -0,0 +1,34 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+@file wsgi.py
+@description 生产环境WSGI入口
+@functionality
+    - 按与开发服务器相同的顺序初始化日志、系统目录、Flask应用与核心组件
+    - 多进程部署时仅由0号工作进程启动清理调度器
+    - 启动命令：gunicorn -c gunicorn.conf.py wsgi:application
+@author D.C.Y <https://dcyyd.github.io>
+@version 1.2.1
+@license MIT
+@copyright © 2025 D.C.Y. All rights reserved.
+"""
+
+import os
+
+from app import (
+    initialize_core_components,
+    initialize_flask_app,
+    initialize_system,
+    setup_logging,
+    setup_request_hooks,
+    setup_routes
+)
+
+setup_logging()
+initialize_system()
+application = initialize_flask_app()
+setup_request_hooks(application)
+# 工作进程编号由 gunicorn.conf.py 分配，直接运行时未设置则视为唯一进程
+initialize_core_components(start_scheduler=os.environ.get('GUNICORN_WORKER_ID') in (None, '0'))
+setup_routes(application)